@@ -1,4 +1,10 @@
+import io
+
 import streamlit as st
+
+from bmi_core import CATEGORIES, IN_TO_M, LB_TO_KG, bmi_category, compute_bmi
+from bmi_for_age import REFERENCES, bmi_z, child_category, z_to_percentile
+
 st.set_page_config(page_title= "BMI Calculator", layout= "centered")
 st.title("BMI Calculator")
 st.caption("BMI= weight (kg)/[height (m)]²")
@@ -21,38 +27,44 @@ else:
     with col3:
         height_in = st.number_input("Height (in)", min_value=0.0, value=9.0, step=0.1)
     # Convert to metric
-    weight_kg = weight_lb * 0.45359237
+    weight_kg = weight_lb * LB_TO_KG
     total_inches = height_ft * 12.0 + height_in
-    height_m = total_inches * 0.0254
+    height_m = total_inches * IN_TO_M
 
-    # --- Compute BMI ---
-def compute_bmi(w_kg: float, h_m: float) -> float:
-    if h_m <= 0:
-        return 0.0
-    return w_kg / (h_m ** 2)
+# Children and teens are scored against BMI-for-age references, not adult cutoffs
+child = st.checkbox("Child or teen (BMI-for-age)")
+if child:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sex = st.radio("Sex", ["Male", "Female"], horizontal=True)
+    with col2:
+        age_years = st.number_input("Age (years)", min_value=2.0, max_value=20.0, value=10.0, step=0.5)
+    with col3:
+        reference = st.selectbox("Reference", REFERENCES,
+                                 help="WHO2007: 5-19 years. CDC2000: 2-20 years.")
 
-bmi = round(compute_bmi(weight_kg, height_m), 2)
+# --- Compute BMI ---
+# Same vectorized functions as batch mode below
+bmi = round(float(compute_bmi(weight_kg, height_m)), 2)
 
 # --- Categorize (WHO) ---
-def bmi_category(b: float) -> str:
-    if b == 0:
-        return "Invalid height"
-    if b < 18.5:
-        return "Underweight"
-    if b < 25:
-        return "Normal weight"
-    if b < 30:
-        return "Overweight"
-    return "Obesity"
-
-category = bmi_category(bmi)
+category = bmi_category(bmi, weight_kg)
 
 # --- Display ---
 st.subheader("Results")
 if bmi == 0:
     st.warning("Please enter a valid height greater than 0.")
+elif category == "Invalid weight":
+    st.warning("Please enter a valid weight greater than 0.")
 else:
     st.metric(label="Your BMI", value=bmi)
+    if child:
+        z = bmi_z(bmi, age_years * 12.0, 1 if sex == "Male" else 2, reference)
+        category = child_category(z, reference)
+        if category == "Out of range":
+            st.warning(f"Age {age_years:g} is outside the {reference} reference range.")
+        else:
+            st.write(f"**BMI-for-age z-score:** {z:.2f} (percentile {z_to_percentile(z):.1f}, {reference})")
     st.write(f"**Category:** {category}")
 
     # Simple progress visualization (scaled roughly to BMI 40)
@@ -60,15 +72,62 @@ else:
     pct = min(bmi / max_bmi, 1.0)
     st.progress(pct)
 
-    with st.expander("What your category means"):
-        st.markdown(
-            """
-- **Underweight (< 18.5):** Consider a nutrient-dense diet and speak with a clinician if needed.  
-- **Normal (18.5—24.9):** Great—maintain balanced nutrition and regular activity.  
-- **Overweight (25—29.9):** Small, sustainable changes in diet and activity can help.  
-- **Obesity (≥ 30):** Discuss comprehensive options with a healthcare professional.
-            """
-        )
+    # Adult cutoffs only
+    if not child:
+        with st.expander("What your category means"):
+            st.markdown(
+                """
+    - **Underweight (< 18.5):** Consider a nutrient-dense diet and speak with a clinician if needed.  
+    - **Normal (18.5—24.9):** Great—maintain balanced nutrition and regular activity.  
+    - **Overweight (25—29.9):** Small, sustainable changes in diet and activity can help.  
+    - **Obesity (≥ 30):** Discuss comprehensive options with a healthcare professional.
+                """
+            )
+
+# --- Batch mode ---
+@st.cache_resource(max_entries=4, ttl=3600, show_spinner="Scoring file...")
+def score_file(file_id: str, _file) -> tuple:
+    # Keyed on the upload id so download clicks don't rescore the file.
+    # cache_resource hands back the same bytes on every rerun; cache_data
+    # would unpickle a fresh copy of the whole scored file each time.
+    # Batch mode brings in pandas; the single-person page never needs it.
+    from bmi_batch import process_csv
+
+    _file.seek(0)
+    buf = io.BytesIO()
+    with io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=True) as out:
+        counts, child_counts = process_csv(_file, out)
+        scored = buf.getvalue()
+    counts.flags.writeable = False
+    return counts, child_counts, scored
+
+
+with st.expander("📁 Batch mode (CSV upload)"):
+    st.markdown(
+        "Upload a screening file with either `weight_kg`, `height_cm` (metric) or "
+        "`weight_lb`, `height_ft`, `height_in` (imperial) columns. Add `sex` and `age_years` "
+        "or `age_months` to also get BMI-for-age z-scores and percentiles. Rows are processed in chunks."
+    )
+    upload = st.file_uploader("Screening file", type=["csv"])
+    if upload is not None:
+        try:
+            counts, child_counts, scored = score_file(upload.file_id, upload)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.write(f"**Rows scored:** {int(counts.sum()):,}")
+            adult = {c: int(n) for c, n in zip(CATEGORIES, counts) if n}
+            if child_counts is None:
+                st.bar_chart(adult, horizontal=True)
+            else:
+                # A file with sex and age is a pediatric roster: lead with BMI-for-age
+                tab_child, tab_adult = st.tabs(["BMI-for-age (WHO2007)", "Adult cutoffs"])
+                with tab_child:
+                    st.bar_chart({c: n for c, n in child_counts.items() if n}, horizontal=True)
+                with tab_adult:
+                    st.bar_chart(adult, horizontal=True)
+            st.download_button("Download results (CSV)", scored,
+                               file_name="bmi_results.csv", mime="text/csv")
 
 # --- Footer note ---
 st.caption("Note: BMI is a screening tool and does not directly assess body fat, distribution, or overall health.")
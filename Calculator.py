@@ -25,3 +25,51 @@ if st.button("Calculate"):
     except Exception as e:
         st.error(str(e))       
 
+
+# --- Expression mode ---
+# Formulas over whole table columns, evaluated as one vectorized pass
+if st.toggle("Expression mode (formulas over a table)"):
+    import numpy as np
+    import pandas as pd
+
+    from expr_eval import ExpressionError, alias, evaluate
+    from healthcare_data import METRICS, district_table, load_dataset
+
+    source = st.selectbox("Table", ["Healthcare districts", "Healthcare towns", "Upload CSV"])
+    if source == "Healthcare districts":
+        table = district_table().reset_index()
+        names = {k: k for k in table.columns if k in METRICS or k == "towns"}
+    elif source == "Healthcare towns":
+        table = load_dataset()
+        names = {k: m.column for k, m in METRICS.items() if m.column in table.columns}
+    else:
+        upload = st.file_uploader("CSV file", type=["csv"])
+        if upload is None:
+            st.stop()
+        table = pd.read_csv(upload)
+        names = {alias(c): c for c in table.select_dtypes("number").columns}
+
+    # Short names and `exact column names` both resolve to the same array
+    # Read-only views: the district and town tables are shared by every session
+    columns = {}
+    for name, col in names.items():
+        values = table[col].to_numpy().view()
+        values.flags.writeable = False
+        columns[name] = columns[col] = values
+    st.caption("Columns: " + ", ".join(f"`{n}`" for n in names))
+
+    formula = st.text_input("Formula", "pharmacies / care_centers * 100")
+    result_name = st.text_input("Result column", "result")
+    if formula.strip():
+        try:
+            values = evaluate(formula, columns, len(table))
+        except ExpressionError as e:
+            st.error(str(e))
+        else:
+            undefined = int(np.isnan(values).sum())
+            if undefined:
+                st.caption(f"{undefined:,} rows are undefined (e.g. division by zero) and left blank.")
+            result = table.assign(**{result_name or "result": values})
+            st.dataframe(result, hide_index=True)
+            st.download_button("Download results (CSV)", result.to_csv(index=False),
+                               file_name="calculator_results.csv", mime="text/csv")
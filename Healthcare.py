@@ -1,6 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+import perf
+from healthcare_charts import (analytics_section, change_section, map_section, ranked_bar_section,
+                               town_lookup_section)
+from healthcare_data import shared_store
+from healthcare_store import yearly_table
 
 # ----------------------- Page Setup -----------------------
 st.set_page_config(page_title="Healthcare in Lebanon", page_icon="🏥", layout="wide")
@@ -10,6 +14,11 @@ with st.sidebar:
     st.markdown("## 🛠️ Display Settings")
     mobile_fix = st.checkbox("📱 Enable Mobile View", value=False)
     dark_mode = st.checkbox("🌙 Enable Dark Mode", value=False)
+    show_perf = st.checkbox("⏱️ Show Performance Panel", value=False)
+    trace_alloc = st.checkbox("Trace allocations", value=False, disabled=not show_perf)
+
+# Per-stage timings, recorded only while the panel is on
+recorder = perf.attach(show_perf, show_perf and trace_alloc)
 
 # Dynamic theming
 background_color = "#1e1e1e" if dark_mode else "#EDF2F7"
@@ -50,15 +59,14 @@ st.markdown("""## Overview""")
 st.markdown(""" "The health sector in Lebanon operates under the leadership of the Ministry of Public Health (MoPH). Complementing this leadership from the UN and NGO sides, the sector is co-led by the World Health Organization (WHO), with coordination efforts facilitated by WHO and Amel Association." """)
 
 # ---------------------- Load Data -----------------------
-df = pd.read_csv("healthcareds.csv")
-if "refArea" in df.columns and "Districts and Governorates" not in df.columns:
-    df["Districts and Governorates"] = df["refArea"].astype(str).str.split("/").str[-1].str.strip()
-
-# Process metrics
-NEEDS_COL = "Existence of special needs care centers - exists"
-AID_COL = "Existence of a first aid center - exists"
-df["_needs"] = df[NEEDS_COL].astype(str).str.strip().str.lower().isin({"yes", "y", "true", "t", "1", "exist", "exists"}).astype(int)
-df["_aid"] = df[AID_COL].astype(str).str.strip().str.lower().isin({"yes", "y", "true", "t", "1", "exist", "exists"}).astype(int)
+# Every registered metric per district, ranked once per file version,
+# and the same metrics summed per map governorate. Yearly sums come from the
+# ingested store (ingest.py), when there is one.
+with perf.stage("data", cached=True):
+    snapshot = shared_store().current()
+    ranked = snapshot.rankings
+    regions = snapshot.governorates
+    yearly = yearly_table()
 
 # ---------------------- Special Needs Chart -----------------------
 st.header("Areas with Special Needs Care Centers in Lebanon")
@@ -69,57 +77,12 @@ st.markdown("""
 According to UN study done in 2023, approximately 10-15% of the Lebanese population have disabilities, either in the form of physical, sensory, cognitive, or mental. Additionally, in 2018, 61.4% of households locally were considered to have at least one member with a disability. The high prevalence of special needs cases demands for accessibility to well-maintained care centers across the various regions in Lebanon.
 The bar chart demonstrates the presence of special needs care centers per area across Lebanon by count, denoted by “N”. The slider is there to indicate which areas have the least to the most accessibility to special needs care centers. The Highlight Areas feature is there to compare selected areas together.""")
 
-counts_needs = (
-    df.groupby("Districts and Governorates")["_needs"]
-    .sum(min_count=1)
-    .fillna(0)
-    .astype(int)
-    .reset_index()
-    .rename(columns={"_needs": "count"})
-    .sort_values("count", ascending=False)
-)
-
-top_n_needs = st.slider("Top N (Special Needs)", 1, len(counts_needs), min(10, len(counts_needs)), key="top_n_needs")
-# Slice top N and copy
-counts_needs_f = counts_needs.head(top_n_needs).copy()
-
-# Select areas to highlight
-highlight_needs = st.multiselect("Highlight Areas (Special Needs)", counts_needs_f["Districts and Governorates"].tolist())
-
-# Assign color based on highlight
-highlight_set = set(highlight_needs)
-counts_needs_f["highlight"] = counts_needs_f["Districts and Governorates"].apply(
-    lambda x: "Highlighted" if x in highlight_set else "Normal"
-)
-
-# Color map
-color_map_needs = {
-    "Highlighted": "#1E40AF",  # Dark blue
-    "Normal": "#60A5FA"        # Light blue
-}
-
-
-fig_needs = px.bar(
-    counts_needs_f.sort_values("count"),
-    x="count",
-    y="Districts and Governorates",
-    orientation="h",
-    text="count",
-    color="highlight",  # use the label
-    color_discrete_map=color_map_needs
-)
-fig_needs.update_traces(textposition="auto", cliponaxis=False)
-fig_needs.update_layout(
-    title={"text": "Areas with Special Needs Care Centers in Lebanon", "x": 0.5, "xanchor": "center"},
-    paper_bgcolor=background_color,
-    plot_bgcolor=background_color,
-    font_color=text_color,
-    xaxis_title="Number of Special Needs Care Centers",
-    yaxis_title="Governorate / District",
-    height=max(500, 30 * len(counts_needs_f)),
-)
-fig_needs.update_layout(showlegend=False)
-st.plotly_chart(fig_needs, use_container_width=True)
+# Dark blue + light blue
+ranked_bar_section(ranked["needs"], "needs", "Special Needs",
+                   "Areas with Special Needs Care Centers in Lebanon",
+                   "Number of Special Needs Care Centers",
+                   ("#1E40AF", "#60A5FA"), background_color, text_color,
+                   highlight_top_only=True)
 
 
 st.markdown('<h3 style="text-align:left;">Interpretation</h3>', unsafe_allow_html=True)
@@ -142,52 +105,11 @@ st.markdown("""The Lebanese Red Cross is considered the largest first aid assist
 
 The bar chart showcases the distribution of first aid centers across Lebanon.  It features multiple interactive tools such as the slider which can be used to manipulate the areas contains a certain number of first aid care centers in addition to the Highlight Areas feature which allows you to select certain areas and compare them in real time.""")
 
-counts_aid = (
-    df.groupby("Districts and Governorates")["_aid"]
-    .sum(min_count=1)
-    .fillna(0)
-    .astype(int)
-    .reset_index()
-    .rename(columns={"_aid": "count"})
-    .sort_values("count", ascending=False)
-)
-
-top_n_aid = st.slider("Top N (First Aid)", 1, len(counts_aid), min(10, len(counts_aid)), key="top_n_aid")
-highlight_aid = st.multiselect("Highlight Areas (First Aid)", counts_aid["Districts and Governorates"], key="highlight_aid")
-counts_aid_f = counts_aid.head(top_n_aid).copy()
-counts_aid_f["__color"] = counts_aid_f["Districts and Governorates"].isin(highlight_aid)
-
-counts_aid_f = counts_aid.head(top_n_aid).copy()
-highlight_set = set(highlight_aid)
-
-counts_aid_f["highlight"] = counts_aid_f["Districts and Governorates"].apply(
-    lambda x: "Highlighted" if x in highlight_set else "Normal"
-)
-color_map = {"Highlighted": "#E53935", "Normal": "#FFCDD2"}  # red + light red
-
-
-fig_aid = px.bar( 
-    counts_aid_f.sort_values("count"),
-    x="count",
-    y="Districts and Governorates",
-    orientation="h",
-    text="count",
-    color="highlight",
-    color_discrete_map=color_map
-    )
-
-fig_aid.update_traces(textposition="auto", cliponaxis=False)
-fig_aid.update_layout(
-    title={"text": "First Aid Centers (Ranked by Area)", "x": 0.5, "xanchor": "center"},
-    paper_bgcolor=background_color,
-    plot_bgcolor=background_color,
-    font_color=text_color,
-    xaxis_title="Number of First Aid Centers",
-    yaxis_title="Governorate / District",
-    height=max(500, 30 * len(counts_aid_f)),
-)
-fig_aid.update_layout(showlegend=False)
-st.plotly_chart(fig_aid, use_container_width=True)
+# Red + light red
+ranked_bar_section(ranked["aid"], "aid", "First Aid",
+                   "First Aid Centers (Ranked by Area)",
+                   "Number of First Aid Centers",
+                   ("#E53935", "#FFCDD2"), background_color, text_color)
 
 st.markdown('<h3 style="text-align:left;">Interpretation</h3>', unsafe_allow_html=True)
 st.markdown("""
@@ -200,3 +122,39 @@ st.markdown("""
 st.markdown('<h3 style="text-align:left;">The Impact</h3>', unsafe_allow_html=True)
 st.markdown("""
 Based on the above distribution, areas with limited access to first aid share dire consequences to those falling ill or facing accidents. Specifically, conditions and injuries can quickly worsen, with an increased chance of death, long term complications and higher chance of infection. The lack of presence of trained individuals with the necessary supplies puts patients at high risk. This calls for immediate action of increasing the number of first aid centers to cater to the public.""")
+
+# ---------------------- Town Lookup -----------------------
+st.header("Look Up a Town")
+st.markdown("""
+Type part of a town's name to see every indicator recorded for it. Spelling variants are matched too, so “Aridet”, “Aaridet” and “Cheikh”/“Sheikh” find the same town.""")
+
+town_lookup_section(snapshot)
+
+# ---------------------- Governorate Map -----------------------
+st.header("Health Resources by Governorate")
+
+st.markdown('<h3 style="text-align:left;">Context</h3>', unsafe_allow_html=True)
+st.markdown("""
+The map colors each governorate by the selected measure, adding up every town in its districts. Boundaries follow the six governorates in place before 2014, so Akkar is shown within North Lebanon and Baalbek-Hermel within the Beqaa. Governorates without survey data are shown in grey.""")
+
+# Lighter outlines on phones: same shapes, fewer points
+map_section(regions, background_color, text_color,
+            detail="simplified" if mobile_fix else "full")
+
+# ---------------------- Year over Year -----------------------
+if yearly is not None and yearly.index.get_level_values("year").nunique() > 1:
+    st.header("Change Between Survey Years")
+    st.markdown("""
+The chart compares two survey years district by district, using every extract ingested for each year. Green bars show areas that gained centers, red bars areas that lost them.""")
+    change_section(yearly, background_color, text_color)
+
+# ---------------------- District Analytics -----------------------
+st.header("District Analytics")
+st.markdown("""
+Coverage ratios, facilities per town and an underserved score across every indicator, for a closer look behind the charts above.""")
+
+analytics_section(snapshot, background_color, text_color)
+
+if recorder is not None:
+    with st.sidebar:
+        perf.panel(recorder)
@@ -10,19 +10,18 @@ st.markdown("<h1 style='text-align: center;'>Healthcare in Lebanon</h1>", unsafe
 df = pd.read_csv("healthcareds.csv")
 
 import os
-from PIL import Image  # Pillow comes with Streamlit
+from image_cache import display_width, image_bytes, list_images
 
 # ==== STATIC PHOTO ROTATOR ====
+# Folder scanned once per change; photos served as cached renditions sized for the device
 IMAGE_DIR = "images"
-image_files = [os.path.join(IMAGE_DIR, f) for f in os.listdir(IMAGE_DIR)
-               if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+image_files = list_images(IMAGE_DIR)
 
 if "carousel_idx" not in st.session_state:
     st.session_state.carousel_idx = 0
 
 if image_files:
-    idx = st.session_state.carousel_idx
-    img = Image.open(image_files[idx])
+    idx = st.session_state.carousel_idx % len(image_files)
 
     # Counter + dots
     count_text = f"{idx+1} / {len(image_files)}"
@@ -37,7 +36,7 @@ if image_files:
     )
 
     # Display current image
-    st.image(img, use_container_width=True, caption=os.path.basename(image_files[idx]))
+    st.image(image_bytes(image_files[idx], display_width()), use_container_width=True, caption=os.path.basename(image_files[idx]))
 
     # Navigation buttons
     c1, c2, c3 = st.columns([1,1,1])
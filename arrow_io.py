@@ -0,0 +1,30 @@
+import os
+
+import pandas as pd
+
+# Uncompressed Arrow IPC (Feather v2) files shared by the healthcare snapshot,
+# the extract store and the Uber cache. Categoricals round-trip as
+# dictionary-encoded columns. pyarrow is imported on first use only.
+
+
+def write_arrow(df: pd.DataFrame, out: str) -> None:
+    # Written to a temporary name and renamed, so readers never see a half-written file
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    tmp = f"{out}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp,
+                              compression="uncompressed")
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def read_arrow(path: str) -> pd.DataFrame:
+    # Memory-mapping only avoids a read buffer: to_pandas() still copies every
+    # column into pandas memory, so the frame costs as much as one parsed from CSV
+    import pyarrow.feather as feather
+
+    return feather.read_table(path, memory_map=True).to_pandas()
@@ -0,0 +1,182 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import time
+
+import numpy as np
+
+# Headless rerun-latency benchmarks for the Streamlit apps, driven by AppTest.
+#   python benchmarks/bench_apps.py [-o bench_results.json] [--repeat 3]
+#   python benchmarks/bench_apps.py --compare old.json new.json
+# Each scenario runs in a fresh process: its first run is the cold start and
+# every scripted interaction after that is one timed rerun.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMEOUT = 120
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+# ---------------------- Scenarios -----------------------
+# Each scenario sets widget values on the AppTest and yields once per rerun.
+def healthcare_top_n_sweep(at):
+    for key in ("top_n_needs", "top_n_aid"):
+        slider = at.slider(key=key)
+        for n in list(range(int(slider.min), int(slider.max) + 1)) + [10]:
+            at.slider(key=key).set_value(n)
+            yield
+
+
+def healthcare_highlight(at):
+    for key in ("highlight_needs", "highlight_aid"):
+        options = at.multiselect(key=key).options
+        for i in range(len(options)):
+            at.multiselect(key=key).set_value(options[: i % 4 + 1])
+            yield
+        at.multiselect(key=key).set_value([])
+        yield
+
+
+def healthcare_theme_toggle(at):
+    for _ in range(10):
+        for box in list(at.sidebar.checkbox)[:2]:  # mobile view, dark mode
+            box.set_value(not box.value)
+            yield
+
+
+def healthcare_bu_carousel(at):
+    for label in ["Next ▶︎"] * 6 + ["◀︎ Previous"] * 6:
+        _button(at, label).click()
+        yield
+
+
+def bmi_unit_switch(at):
+    for i in range(10):
+        at.radio[0].set_value(at.radio[0].options[i % 2])
+        yield
+        at.number_input[0].set_value(at.number_input[0].value + 1)
+        yield
+
+
+def calculator_ops(at):
+    for op in ["+", "-", "×", "÷"] * 3:
+        at.number_input[0].set_value(12.5)
+        at.number_input[1].set_value(4.0)
+        at.selectbox[0].set_value(op)
+        _button(at, "Calculate").click()
+        yield
+
+
+SCENARIOS = {
+    "healthcare_top_n_sweep": ("Healthcare.py", healthcare_top_n_sweep),
+    "healthcare_highlight": ("Healthcare.py", healthcare_highlight),
+    "healthcare_theme_toggle": ("Healthcare.py", healthcare_theme_toggle),
+    "healthcare_bu_carousel": ("HealthcareBU.py", healthcare_bu_carousel),
+    "bmi_unit_switch": ("BMI.py", bmi_unit_switch),
+    "calculator_ops": ("Calculator.py", calculator_ops),
+}
+
+
+# ---------------------- Runner -----------------------
+def run_scenario(name: str, repeat: int) -> dict:
+    # Runs in a worker process so cold start and peak RSS are per scenario
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    app, scenario = SCENARIOS[name]
+    t0 = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=TIMEOUT).run()
+    cold_start = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{app} failed on first run: {at.exception[0].message}")
+
+    latencies = []
+    for _ in range(repeat):
+        for _ in scenario(at):
+            t0 = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - t0)
+            if at.exception:
+                raise RuntimeError(f"{app} failed during {name}: {at.exception[0].message}")
+
+    ms = np.array(latencies) * 1000
+    return {
+        "scenario": name,
+        "app": app,
+        "reruns": len(ms),
+        "cold_start_ms": round(cold_start * 1000, 2),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as f:
+        old = {r["scenario"]: r for r in json.load(f)["scenarios"]}
+    with open(new_path) as f:
+        new = json.load(f)["scenarios"]
+    print(f"{'scenario':<28}{'metric':<15}{'old':>10}{'new':>10}{'change':>9}")
+    for r in new:
+        base = old.get(r["scenario"])
+        if base is None:
+            continue
+        for metric in ("cold_start_ms", "p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"):
+            a, b = base[metric], r[metric]
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"{r['scenario']:<28}{metric:<15}{a:>10}{b:>10}{change:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless rerun-latency benchmarks.")
+    parser.add_argument("-o", "--out", default="bench_results.json", help="JSON results file")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="times to replay each scenario")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two results files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = []
+    ctx = mp.get_context("spawn")
+    for name in args.scenario or SCENARIOS:
+        with ctx.Pool(1) as pool:
+            r = pool.apply(run_scenario, (name, args.repeat))
+        results.append(r)
+        print(f"{name:<28} cold {r['cold_start_ms']:>8.1f} ms   p50 {r['p50_ms']:>7.1f}   "
+              f"p95 {r['p95_ms']:>7.1f}   p99 {r['p99_ms']:>7.1f} ms   rss {r['peak_rss_mb']:>6.1f} MB")
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+    }
+    with open(args.out, "w") as f:
+        json.dump({"meta": meta, "scenarios": results}, f, indent=2)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
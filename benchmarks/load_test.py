@@ -0,0 +1,249 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from bench_apps import ROOT, git_commit
+
+# Concurrent-viewer load test for Healthcare.py against one local server process.
+#   python benchmarks/load_test.py [--sessions 1 2 4 8 16] [--actions 30] [-o load_results.json]
+# The server is started with serve.py. For each level N, a pool of N worker
+# processes opens N browser-like websocket sessions. Each loads the page, waits
+# for the others, then replays a random trace of Top N, highlight and theme
+# changes. Latency is from sending a rerun to the server's script_finished;
+# memory is the server's resident set size, sampled while the sessions are live.
+
+HEALTH_TIMEOUT = 60
+RECV_TIMEOUT = 120
+# Action mix of a simulated viewer
+ACTIONS = {"top_n": 0.4, "highlight": 0.35, "theme": 0.25}
+THEME_LABELS = ("📱 Enable Mobile View", "🌙 Enable Dark Mode")
+
+
+# ---------------------- Simulated Session -----------------------
+class Session:
+    # Minimal Streamlit browser client: sends reruns with the full widget
+    # state and tracks the widgets each run renders
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}   # label -> (widget proto, fragment id)
+        self.states = {}    # widget id -> WidgetState
+        self.errors = 0
+
+    def rerun(self, fragment_id: str = "") -> float:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        t0 = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=RECV_TIMEOUT))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                name = element.WhichOneof("type")
+                if name == "exception":
+                    self.errors += 1
+                elif name in ("slider", "multiselect", "checkbox"):
+                    widget = getattr(element, name)
+                    self.widgets[widget.label] = (widget, fwd.delta.fragment_id)
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                return (time.perf_counter() - t0) * 1000
+
+    def _set(self, label: str, **value) -> str:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        for field, data in value.items():
+            if isinstance(data, list):
+                getattr(state, field).data.extend(data)
+            else:
+                setattr(state, field, data)
+        self.states[widget.id] = state
+        return fragment_id
+
+    def random_action(self, rng: random.Random) -> tuple:
+        # (action, fragment id to rerun, "" for the whole page)
+        action = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        metric = rng.choice(["Special Needs", "First Aid"])
+        if action == "top_n":
+            slider, _ = self.widgets[f"Top N ({metric})"]
+            n = rng.randint(int(slider.min), int(slider.max))
+            return action, self._set(f"Top N ({metric})", double_array_value=[float(n)])
+        if action == "highlight":
+            options = list(self.widgets[f"Highlight Areas ({metric})"][0].options)
+            picked = rng.sample(options, rng.randint(0, min(3, len(options))))
+            return action, self._set(f"Highlight Areas ({metric})", string_array_value=picked)
+        label = rng.choice(THEME_LABELS)
+        state = self.states.get(self.widgets[label][0].id)
+        on = not (state.bool_value if state is not None else self.widgets[label][0].default)
+        self._set(label, bool_value=on)
+        return action, ""
+
+
+_barrier = None
+
+
+def _init_worker(barrier) -> None:
+    global _barrier
+    _barrier = barrier
+
+
+def run_session(port: int, seed: int, actions: int, think: float) -> dict:
+    from websockets.sync.client import connect
+
+    rng = random.Random(seed)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    with connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=HEALTH_TIMEOUT) as ws:
+        session = Session(ws)
+        first_load = session.rerun()
+        _barrier.wait()  # every session loaded: start the timed phase together
+        start = time.time()
+        latencies, kinds = [], []
+        for _ in range(actions):
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+            kind, fragment_id = session.random_action(rng)
+            latencies.append(session.rerun(fragment_id))
+            kinds.append(kind)
+        end = time.time()
+        _barrier.wait()  # keep the connection open until all sessions finish
+    return {"first_load_ms": first_load, "latencies": latencies, "kinds": kinds,
+            "errors": session.errors, "start": start, "end": end}
+
+
+# ---------------------- Server -----------------------
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    # Some kernels and sandboxes leave VmRSS out of status; statm always has it
+    with open(f"/proc/{pid}/statm") as f:
+        resident = int(f.read().split()[1])
+    if not resident:
+        raise RuntimeError(f"cannot read the resident set size of process {pid}")
+    return resident * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def start_server(app: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, STREAMLIT_SERVER_HEADLESS="true",
+               STREAMLIT_BROWSER_GATHER_USAGE_STATS="false",
+               STREAMLIT_SERVER_FILE_WATCHER_TYPE="none")
+    server = subprocess.Popen([sys.executable, "serve.py", app, "--port", str(port)], cwd=ROOT,
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + HEALTH_TIMEOUT
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"server for {app} did not answer on port {port}")
+
+
+def run_level(server: subprocess.Popen, port: int, n: int, actions: int, think: float, seed: int) -> dict:
+    ctx = mp.get_context("spawn")
+    baseline = rss_mb(server.pid)
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(0.05):
+            peak[0] = max(peak[0], rss_mb(server.pid))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    with ctx.Pool(n, initializer=_init_worker, initargs=(ctx.Barrier(n),)) as pool:
+        runs = pool.starmap(run_session, [(port, seed * 1000 + i, actions, think) for i in range(n)])
+    done.set()
+    sampler.join()
+
+    ms = np.concatenate([r["latencies"] for r in runs])
+    kinds = np.concatenate([r["kinds"] for r in runs])
+    wall = max(r["end"] for r in runs) - min(r["start"] for r in runs)
+    pct = lambda a, q: round(float(np.percentile(a, q)), 2)
+    return {
+        "sessions": n,
+        "reruns": len(ms),
+        "errors": sum(r["errors"] for r in runs),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(ms) / wall, 2) if wall else None,
+        "first_load_p50_ms": pct([r["first_load_ms"] for r in runs], 50),
+        "p50_ms": pct(ms, 50),
+        "p95_ms": pct(ms, 95),
+        "p99_ms": pct(ms, 99),
+        "by_action_p50_ms": {k: pct(ms[kinds == k], 50) for k in ACTIONS if (kinds == k).any()},
+        "server_rss_mb": round(peak[0], 1),
+        "rss_per_session_mb": round((peak[0] - baseline) / n, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for Healthcare.py.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrency levels to run (default: 1 2 4 8 16)")
+    parser.add_argument("--actions", type=int, default=30, help="interactions per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between actions, seconds")
+    parser.add_argument("--port", type=int, default=8650, help="port for the test server")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the interaction traces")
+    parser.add_argument("-o", "--out", default="load_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    app = "Healthcare.py"
+    server = start_server(app, args.port)
+    try:
+        # The first script run imports the page's modules; keep that out of level 1
+        run_level(server, args.port, 1, 1, 0.0, args.seed)
+        idle = rss_mb(server.pid)
+        levels = []
+        for n in args.sessions:
+            r = run_level(server, args.port, n, args.actions, args.think, args.seed)
+            levels.append(r)
+            print(f"N={n:<4} {r['throughput_rps']:>8.1f} reruns/s   p50 {r['p50_ms']:>7.1f}   "
+                  f"p95 {r['p95_ms']:>7.1f}   p99 {r['p99_ms']:>7.1f} ms   "
+                  f"rss {r['server_rss_mb']:>7.1f} MB ({r['rss_per_session_mb']:+.2f}/session)"
+                  + (f"   errors {r['errors']}" if r["errors"] else ""))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "app": app,
+        "actions": args.actions,
+        "think_s": args.think,
+        "seed": args.seed,
+        "idle_rss_mb": round(idle, 1),
+    }
+    with open(args.out, "w") as f:
+        json.dump({"meta": meta, "levels": levels}, f, indent=2)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
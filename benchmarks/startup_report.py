@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from bench_apps import ROOT, git_commit
+
+# Cold-start import report: which modules each app's first run has to import.
+#   python benchmarks/startup_report.py [Healthcare.py BMI.py ...] [--repeat 3] [-o startup_report.json]
+# Each app runs in a fresh `python -X importtime` process. Streamlit is imported
+# first, then the script runs once in bare mode (no server, so widgets keep their
+# defaults, like a first visitor's page). The imports logged after Streamlit are
+# the app's own cost, summed per top-level package (pandas, plotly, ...) so a
+# heavy dependency shows up under its own name, not under the module that
+# happened to import it first.
+# With --repeat, the run with the median first-run time is reported.
+
+APPS = ("Healthcare.py", "HealthcareBU.py", "uber_pickups.py", "BMI.py", "Calculator.py")
+MARK = "@@startup"
+PROBE = f"""\
+import runpy, sys, time
+t0 = time.perf_counter()
+import streamlit
+sys.stderr.write("{MARK} %f\\n" % (time.perf_counter() - t0))
+t0 = time.perf_counter()
+try:
+    runpy.run_path(sys.argv[1], run_name="__main__")
+except BaseException as e:
+    sys.stderr.write("{MARK}error %s: %s\\n" % (type(e).__name__, e))
+sys.stderr.write("{MARK} %f\\n" % (time.perf_counter() - t0))
+"""
+
+
+def parse_importtime(lines: list) -> list:
+    # "import time: self [us] | cumulative | <indent>package" -> (name, self_us, cum_us)
+    rows = []
+    for line in lines:
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        rows.append((name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+
+def profile_app(app: str, top: int) -> dict:
+    env = dict(os.environ, STREAMLIT_BROWSER_GATHER_USAGE_STATS="false")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE, app], cwd=ROOT, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    phases, walls, error = [[]], [], None
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:"):
+            phases[-1].append(line)
+        elif line.startswith(MARK + "error"):
+            error = line[len(MARK + "error "):]
+        elif line.startswith(MARK):
+            walls.append(float(line.split()[1]) * 1000)
+            phases.append([])
+    if len(walls) < 2:
+        raise RuntimeError(f"{app} did not finish:\n{out.stderr[-2000:]}")
+
+    base, run = parse_importtime(phases[0]), parse_importtime(phases[1])
+    packages = {}
+    for name, self_us, _ in run:
+        total, count = packages.get(name.split(".")[0], (0, 0))
+        packages[name.split(".")[0]] = (total + self_us, count + 1)
+    slowest = sorted(packages.items(), key=lambda p: -p[1][0])[:top]
+    return {
+        "app": app,
+        "streamlit_ms": round(walls[0], 1),
+        "first_run_ms": round(walls[1], 1),
+        "startup_imports_ms": round(sum(r[1] for r in base) / 1000, 1),
+        "app_imports_ms": round(sum(r[1] for r in run) / 1000, 1),
+        "app_modules": len(run),
+        "slowest": [{"package": name, "ms": round(us / 1000, 1), "modules": count}
+                    for name, (us, count) in slowest],
+        "error": error,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-app cold-start import report.")
+    parser.add_argument("apps", nargs="*", default=list(APPS), help="app scripts (default: all)")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports listed per app")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per app; the median run is kept")
+    parser.add_argument("-o", "--out", default="startup_report.json", help="JSON results file")
+    args = parser.parse_args()
+
+    results = []
+    for app in args.apps:
+        runs = sorted((profile_app(app, args.top) for _ in range(args.repeat)),
+                      key=lambda r: r["first_run_ms"])
+        r = runs[len(runs) // 2]
+        results.append(r)
+        print(f"{app:<18} streamlit {r['streamlit_ms']:>7.1f} ms   first run {r['first_run_ms']:>7.1f} ms   "
+              f"(imports {r['app_imports_ms']:.1f} ms, {r['app_modules']} modules)")
+        for s in r["slowest"]:
+            print(f"    {s['package']:<24}{s['ms']:>9.1f} ms  {s['modules']:>4} modules")
+        if r["error"]:
+            print(f"    first run failed: {r['error']}")
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "median_first_run_ms": round(float(np.median([r["first_run_ms"] for r in results])), 1),
+    }
+    with open(args.out, "w") as f:
+        json.dump({"meta": meta, "apps": results}, f, indent=2)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
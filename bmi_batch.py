@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from bmi_core import CATEGORIES, IN_TO_M, INVALID, INVALID_WEIGHT, LB_TO_KG, MISSING, bmi_codes, compute_bmi
+from bmi_for_age import CHILD_CATEGORIES, SEX_CODES, bmi_z, child_category, z_to_percentile
+
+# Batch (CSV) mode for BMI.py, kept apart from bmi_core so the single-person
+# page never imports pandas; the page imports this only when a file is scored.
+
+METRIC_COLS = ("weight_kg", "height_cm")
+IMPERIAL_COLS = ("weight_lb", "height_ft", "height_in")
+
+
+def sex_codes(s: pd.Series) -> np.ndarray:
+    # 1/2, M/F, male/female, boy/girl -> 1/2 (0 when unrecognized)
+    if pd.api.types.is_numeric_dtype(s):
+        codes = s.fillna(0).to_numpy()
+        return np.where(np.isin(codes, (1, 2)), codes, 0).astype(int)
+    return s.astype(str).str.strip().str.lower().map(SEX_CODES).fillna(0).to_numpy(int)
+
+
+def to_metric(df: pd.DataFrame) -> tuple:
+    # (weight kg, height m) arrays from metric or imperial columns
+    cols = set(df.columns)
+    if cols.issuperset(METRIC_COLS):
+        w = pd.to_numeric(df["weight_kg"], errors="coerce").to_numpy(float)
+        h = pd.to_numeric(df["height_cm"], errors="coerce").to_numpy(float) / 100.0
+        return w, h
+    if "weight_lb" in cols and cols & {"height_ft", "height_in"}:
+        w = pd.to_numeric(df["weight_lb"], errors="coerce").to_numpy(float) * LB_TO_KG
+        nan = np.full(len(df), np.nan)
+        ft = pd.to_numeric(df["height_ft"], errors="coerce").to_numpy(float) if "height_ft" in cols else nan
+        inch = pd.to_numeric(df["height_in"], errors="coerce").to_numpy(float) if "height_in" in cols else nan
+        # Either part may be blank (e.g. total inches only); both blank is missing
+        inches = np.where(np.isnan(ft) & np.isnan(inch), np.nan,
+                          np.nan_to_num(ft) * 12.0 + np.nan_to_num(inch))
+        return w, inches * IN_TO_M
+    raise ValueError(
+        f"Expected columns {', '.join(METRIC_COLS)} (metric) or "
+        f"{', '.join(IMPERIAL_COLS)} (imperial); found {', '.join(df.columns)}"
+    )
+
+
+def age_months(df: pd.DataFrame):
+    if "age_months" in df.columns:
+        return pd.to_numeric(df["age_months"], errors="coerce").to_numpy(float)
+    if "age_years" in df.columns:
+        return pd.to_numeric(df["age_years"], errors="coerce").to_numpy(float) * 12.0
+    return None
+
+
+def process_csv(src, out, chunksize: int = 100_000, reference: str = "WHO2007") -> tuple:
+    # Streams src chunk by chunk into out (with bmi and bmi_category columns)
+    # and returns (rows per category code, rows per BMI-for-age category).
+    # Files that also have sex and age_months/age_years get BMI-for-age
+    # z-score, percentile and category columns (blank outside the reference's
+    # age range); for other files the second count is None.
+    counts = np.zeros(len(CATEGORIES), dtype=np.int64)
+    child_labels = list(CHILD_CATEGORIES[reference]) + list(CATEGORIES[[INVALID, MISSING, INVALID_WEIGHT]])
+    child_counts = None
+    for i, chunk in enumerate(pd.read_csv(src, chunksize=chunksize)):
+        chunk.columns = chunk.columns.str.strip().str.lower()
+        w, h = to_metric(chunk)
+        bmi = np.round(compute_bmi(w, h), 2)
+        codes = bmi_codes(bmi, w)
+        chunk["bmi"] = bmi
+        chunk["bmi_category"] = CATEGORIES[codes]
+        ages = age_months(chunk)
+        if ages is not None and "sex" in chunk.columns:
+            z = bmi_z(bmi, ages, sex_codes(chunk["sex"]), reference)
+            chunk["bmi_z"] = np.round(z, 2)
+            chunk["bmi_percentile"] = np.round(z_to_percentile(z), 1)
+            # Rows without a usable BMI keep its reason rather than "Out of range"
+            no_bmi = np.isin(codes, (INVALID, MISSING, INVALID_WEIGHT))
+            chunk["bmi_for_age_category"] = np.where(no_bmi, CATEGORIES[codes], child_category(z, reference))
+            if child_counts is None:
+                child_counts = pd.Series(0, index=child_labels)
+            child_counts = child_counts.add(chunk["bmi_for_age_category"].value_counts(), fill_value=0)
+        counts += np.bincount(codes, minlength=len(CATEGORIES))
+        chunk.to_csv(out, header=i == 0, index=False)
+    if child_counts is not None:
+        child_counts = {k: int(child_counts[k]) for k in child_labels}
+    return counts, child_counts
@@ -0,0 +1,45 @@
+import numpy as np
+
+# BMI math shared by the single-person page and batch (CSV) mode. Every
+# function takes scalars or NumPy arrays; there is no per-row Python loop.
+# NumPy only: the CSV handling, and with it pandas, is in bmi_batch.
+
+LB_TO_KG = 0.45359237
+IN_TO_M = 0.0254
+
+# WHO adult cutoffs; category codes index CATEGORIES
+CUTOFFS = np.array([18.5, 25.0, 30.0])
+CATEGORIES = np.array(["Invalid height", "Underweight", "Normal weight", "Overweight", "Obesity", "Missing data",
+                       "Invalid weight"])
+INVALID, MISSING, INVALID_WEIGHT = 0, 5, 6
+
+
+def _scalar(x):
+    return x[()] if isinstance(x, np.ndarray) and x.ndim == 0 else x
+
+
+def compute_bmi(w_kg, h_m):
+    w = np.asarray(w_kg, dtype=float)
+    h = np.asarray(h_m, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = np.where(h > 0, w / h ** 2, 0.0)
+    # Missing height stays NaN so it is not mistaken for an invalid (0) one;
+    # a weight of zero or less has no BMI either (see bmi_codes)
+    return _scalar(np.where(np.isnan(h) | ((h > 0) & (w <= 0)), np.nan, bmi))
+
+
+def bmi_codes(b, w_kg=None) -> np.ndarray:
+    # Pass the weights to tell an invalid weight apart from missing data
+    b = np.asarray(b, dtype=float)
+    codes = 1 + np.searchsorted(CUTOFFS, b, side="right")
+    codes = np.where(b == 0, INVALID, codes)
+    codes = np.where(np.isnan(b), MISSING, codes)
+    bad_weight = b < 0
+    if w_kg is not None:
+        bad_weight |= (np.asarray(w_kg, dtype=float) <= 0) & (codes != INVALID)
+    return np.where(bad_weight, INVALID_WEIGHT, codes)
+
+
+def bmi_category(b, w_kg=None):
+    labels = CATEGORIES[bmi_codes(b, w_kg)]
+    return str(labels) if labels.ndim == 0 else labels
@@ -0,0 +1,105 @@
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# BMI-for-age z-scores and percentiles for children and teens, from the LMS
+# reference tables bundled in data/bmi_for_age_lms.csv:
+#   WHO2007 - WHO Growth Reference 5-19 years (BMI-for-age), 60-228 months
+#   CDC2000 - CDC 2000 Growth Charts (bmiagerev), 24-240.5 months
+# Sex follows the CDC coding: 1 = male, 2 = female.
+
+LMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bmi_for_age_lms.csv")
+REFERENCES = ("WHO2007", "CDC2000")
+
+# z-score cutoffs and labels per reference (WHO: SD bands; CDC: 5th/85th/95th percentiles)
+CHILD_CUTOFFS = {
+    "WHO2007": np.array([-3.0, -2.0, 1.0, 2.0]),
+    "CDC2000": np.array([-1.6448536, 1.0364334, 1.6448536]),
+}
+# Whether a z-score exactly at each cutoff belongs to the band above it: WHO
+# thinness is z < -2 but overweight is z > +1; CDC bands start at their percentile
+CUTOFF_STARTS_BAND = {
+    "WHO2007": np.array([True, True, False, False]),
+    "CDC2000": np.array([True, True, True]),
+}
+CHILD_CATEGORIES = {
+    "WHO2007": np.array(["Severe thinness", "Thinness", "Normal weight", "Overweight", "Obesity", "Out of range"]),
+    "CDC2000": np.array(["Underweight", "Healthy weight", "Overweight", "Obesity", "Out of range"]),
+}
+SEX_CODES = {"1": 1, "m": 1, "male": 1, "boy": 1, "2": 2, "f": 2, "female": 2, "girl": 2}
+
+
+@lru_cache(maxsize=None)
+def load_lms(reference: str = "WHO2007") -> tuple:
+    # (ages, lms): ages sorted in months, lms[sex - 1, age_index] = (L, M, S)
+    with open(LMS_PATH, newline="") as f:
+        rows = [(int(r["sex"]), float(r["age_months"]), float(r["L"]), float(r["M"]), float(r["S"]))
+                for r in csv.DictReader(f) if r["reference"] == reference]
+    if not rows:
+        raise ValueError(f"Unknown reference {reference!r}; expected one of {', '.join(REFERENCES)}")
+    table = np.array(sorted(rows))
+    ages = table[table[:, 0] == 1, 1]
+    lms = table[:, 2:].reshape(2, len(ages), 3)
+    ages.flags.writeable = False
+    lms.flags.writeable = False
+    return ages, lms
+
+
+def lms_at(age_months, sex, reference: str = "WHO2007") -> tuple:
+    # Linear interpolation between the two bracketing table ages; NaN outside the table
+    ages, lms = load_lms(reference)
+    a = np.asarray(age_months, dtype=float)
+    s = np.asarray(sex)
+    i = np.clip(np.searchsorted(ages, a, side="right") - 1, 0, len(ages) - 2)
+    t = ((a - ages[i]) / (ages[i + 1] - ages[i]))[..., None]
+    sx = np.where(s == 2, 1, 0)
+    vals = lms[sx, i] * (1 - t) + lms[sx, i + 1] * t
+    valid = (a >= ages[0]) & (a <= ages[-1]) & np.isin(s, (1, 2))
+    vals = np.where(valid[..., None], vals, np.nan)
+    return vals[..., 0], vals[..., 1], vals[..., 2]
+
+
+def _lms_value(L, M, S, z):
+    # BMI at z standard deviations
+    return M * (1 + L * S * z) ** (1 / L)
+
+
+def bmi_z(bmi, age_months, sex, reference: str = "WHO2007"):
+    L, M, S = lms_at(age_months, sex, reference)
+    y = np.asarray(bmi, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(np.abs(L) < 1e-12, np.log(y / M) / S, ((y / M) ** L - 1) / (L * S))
+        if reference == "WHO2007":
+            # WHO's restricted method: beyond +/-3 SD use the 2-3 SD distance
+            sd3p, sd2p = _lms_value(L, M, S, 3), _lms_value(L, M, S, 2)
+            sd3n, sd2n = _lms_value(L, M, S, -3), _lms_value(L, M, S, -2)
+            z = np.where(z > 3, 3 + (y - sd3p) / (sd3p - sd2p), z)
+            z = np.where(z < -3, -3 + (y - sd3n) / (sd2n - sd3n), z)
+    z = np.where(y > 0, z, np.nan)
+    return z[()] if z.ndim == 0 else z
+
+
+def _erf(x):
+    # Abramowitz & Stegun 7.1.26, |error| < 1.5e-7; keeps scipy out of the stack
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1 - poly * np.exp(-x * x))
+
+
+def z_to_percentile(z):
+    p = 50 * (1 + _erf(np.asarray(z, dtype=float) / np.sqrt(2)))
+    return p[()] if p.ndim == 0 else p
+
+
+def child_category(z, reference: str = "WHO2007"):
+    cutoffs = CHILD_CUTOFFS[reference]
+    labels = CHILD_CATEGORIES[reference]
+    z = np.asarray(z, dtype=float)[..., None]
+    passed = np.where(CUTOFF_STARTS_BAND[reference], z >= cutoffs, z > cutoffs)
+    codes = np.where(np.isnan(z[..., 0]), len(labels) - 1, passed.sum(axis=-1))
+    out = labels[codes]
+    return str(out) if out.ndim == 0 else out
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from lebanon_geo import DETAILS, boundary_path
+
+# Convert the Lebanon map from echarts-countries-pypkg into the GeoJSON files
+# read by the Healthcare map, one per detail level:
+#   pip download --no-deps echarts-countries-pypkg   (then unpack the sdist)
+#   python build_boundaries.py .../echarts-countries-js/Lebanon.js
+parser = argparse.ArgumentParser(description="Build the governorate boundary files.")
+parser.add_argument("source", help="Lebanon.js from echarts-countries-pypkg")
+parser.add_argument("--precision", type=int, default=4, help="decimal places kept")
+args = parser.parse_args()
+
+
+def decode_ring(coords: str, offset, scale: float = 1024) -> np.ndarray:
+    # ECharts' compressed geometry: zigzag-encoded deltas, two characters per point
+    deltas = np.array([ord(c) - 64 for c in coords]).reshape(-1, 2)
+    deltas = (deltas >> 1) ^ -(deltas & 1)
+    return (np.cumsum(deltas, axis=0) + offset) / scale
+
+
+def simplify(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    # Douglas-Peucker; a ring that would drop below a triangle is kept as is
+    if tolerance <= 0 or len(ring) <= 4:
+        return ring
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, d = ring[i], ring[j] - ring[i]
+        pts = ring[i + 1:j] - a
+        norm = np.hypot(*d)
+        dist = np.abs(d[0] * pts[:, 1] - d[1] * pts[:, 0]) / norm if norm else np.hypot(*pts.T)
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            keep[i + 1 + k] = True
+            stack += [(i, i + 1 + k), (i + 1 + k, j)]
+    out = ring[keep]
+    return out if len(out) >= 4 else ring
+
+
+with open(args.source, encoding="utf-8") as f:
+    text = f.read()
+source, _ = json.JSONDecoder().raw_decode(text, text.index('{"type"'))
+
+for detail, tolerance in DETAILS.items():
+    features, n_points = [], 0
+    for feature in source["features"]:
+        geom = feature["geometry"]
+        polys = [geom["coordinates"]] if geom["type"] == "Polygon" else geom["coordinates"]
+        offsets = [geom["encodeOffsets"]] if geom["type"] == "Polygon" else geom["encodeOffsets"]
+        out = []
+        for poly, poly_offsets in zip(polys, offsets):
+            rings = [simplify(decode_ring(c, o), tolerance) for c, o in zip(poly, poly_offsets)]
+            n_points += sum(len(r) for r in rings)
+            out.append([np.round(r, args.precision).tolist() for r in rings])
+        features.append({
+            "type": "Feature",
+            "properties": {"name": feature["properties"]["name"]},
+            "geometry": {"type": "Polygon", "coordinates": out[0]} if len(out) == 1
+            else {"type": "MultiPolygon", "coordinates": out},
+        })
+    out_path = boundary_path(detail)
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f, separators=(",", ":"))
+    os.replace(tmp, out_path)
+    print(f"{out_path}: {len(features)} features, {n_points:,} points, "
+          f"{os.path.getsize(out_path):,} bytes (tolerance {tolerance})")
@@ -0,0 +1,26 @@
+import argparse
+import os
+import time
+
+from healthcare_data import DATA_PATH, read_csv, read_snapshot, snapshot_path, write_snapshot
+
+# Convert the healthcare CSV into the columnar snapshot loaded by Healthcare.py:
+#   python build_snapshot.py [healthcareds.csv] [-o healthcareds.arrow]
+parser = argparse.ArgumentParser(description="Build the columnar dataset snapshot.")
+parser.add_argument("csv", nargs="?", default=DATA_PATH, help="source CSV file")
+parser.add_argument("-o", "--out", help="snapshot file (default: next to the CSV)")
+args = parser.parse_args()
+
+out = args.out or snapshot_path(args.csv)
+
+t0 = time.perf_counter()
+df = read_csv(args.csv)
+write_snapshot(df, out)
+t1 = time.perf_counter()
+
+# Read it back the way the dashboard does, so a bad snapshot fails here
+check = read_snapshot(out)
+assert check.shape == df.shape, (check.shape, df.shape)
+
+print(f"{args.csv}: {len(df):,} rows, {os.path.getsize(args.csv):,} bytes")
+print(f"{out}: {os.path.getsize(out):,} bytes, built in {t1 - t0:.2f}s")
@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from plotly.offline import get_plotlyjs
+from streamlit.testing.v1 import AppTest
+
+from healthcare_data import shared_store
+
+# Render the default view of Healthcare.py to static files for plain web hosting:
+#   python export_static.py [-o static_site] [--live-url https://...]
+# The page is run headlessly (light, then dark theme) and its markdown, headers
+# and charts are written out in order; interactive-only sections link to the
+# live app instead. Assets and data downloads carry a content hash in their
+# names, so they can be cached forever; manifest.json lists every file's hash.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Healthcare.py")
+THEMES = {"light": "index.html", "dark": "dark.html"}
+DARK_MODE_LABEL = "🌙 Enable Dark Mode"
+
+parser = argparse.ArgumentParser(description="Export the Healthcare dashboard as static HTML.")
+parser.add_argument("-o", "--out", default="static_site", help="output directory (default: static_site)")
+parser.add_argument("--live-url", default="", help="link for the interactive sections")
+args = parser.parse_args()
+
+manifest = {}
+build_dir = None  # files are written here, then moved to args.out in one step
+
+
+def write_hashed(rel_dir: str, stem: str, ext: str, data: bytes) -> str:
+    # <out>/<rel_dir>/<stem>.<sha256[:12]><ext>; returns the path relative to <out>
+    digest = hashlib.sha256(data).hexdigest()
+    rel = f"{rel_dir}/{stem}.{digest[:12]}{ext}"
+    with open(os.path.join(build_dir, rel), "wb") as f:
+        f.write(data)
+    manifest[rel] = {"sha256": digest, "bytes": len(data)}
+    return rel
+
+
+# ---------------------- Markdown -----------------------
+def inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"(https?://[^\s<]+?)([.,;:)]?(?:\s|$))", r'<a href="\1">\1</a>\2', text)
+
+
+def render_markdown(text: str) -> str:
+    # The subset the page uses: raw HTML, # headers, "- " lists and paragraphs
+    text = text.strip()
+    if text.startswith("<style"):
+        return ""  # Streamlit-specific CSS; the export has its own
+    if text.startswith("<"):
+        return text
+    out = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [ln.strip() for ln in block.strip().splitlines() if ln.strip()]
+        if not lines:
+            continue
+        if lines[0].startswith("#"):
+            level = len(lines[0]) - len(lines[0].lstrip("#"))
+            out.append(f"<h{level}>{inline(lines[0][level:].strip())}</h{level}>")
+        elif all(ln.startswith("- ") for ln in lines):
+            out.append("<ul>" + "".join(f"<li>{inline(ln[2:])}</li>" for ln in lines) + "</ul>")
+        else:
+            out.append(f"<p>{inline(' '.join(lines))}</p>")
+    # Bullets separated by blank lines are still one list
+    return "\n".join(out).replace("</ul>\n<ul>", "")
+
+
+# ---------------------- Page Rendering -----------------------
+def run_page(theme: str) -> AppTest:
+    at = AppTest.from_file(APP, default_timeout=120).run()
+    if theme == "dark":
+        next(c for c in at.sidebar.checkbox if c.label == DARK_MODE_LABEL).check().run()
+    if at.exception:
+        raise RuntimeError(f"{APP} failed: {at.exception}")
+    return at
+
+
+def render_nodes(node, figures: list) -> list:
+    parts = []
+    for key in sorted(node.children):
+        child = node.children[key]
+        kind = getattr(child, "type", None)
+        if kind == "markdown":
+            parts.append(render_markdown(child.value))
+        elif kind == "header":
+            parts.append(f"<h2>{inline(child.value)}</h2>")
+        elif kind == "caption":
+            parts.append(f'<p class="caption">{inline(child.value)}</p>')
+        elif kind == "plotly_chart":
+            figures.append(json.loads(child.proto.spec))
+            parts.append(f'<div class="chart" id="fig{len(figures) - 1}"></div>')
+        elif getattr(child, "children", None):
+            inner = render_nodes(child, figures)
+            if any(p.startswith('<div class="chart"') for p in inner):
+                parts += inner
+            else:  # a section made only of widgets
+                link = f'<a href="{html.escape(args.live_url)}">interactive dashboard</a>' \
+                    if args.live_url else "interactive dashboard"
+                parts.append(f'<p class="live">Available in the {link}.</p>')
+    return parts
+
+
+def page(at: AppTest, theme: str, plotly_src: str, downloads: list) -> str:
+    figures = []
+    body = "\n".join(p for p in render_nodes(at.main, figures) if p)
+    layout = figures[0]["layout"] if figures else {}
+    bg = layout.get("paper_bgcolor", "#FFFFFF")
+    fg = layout.get("font", {}).get("color", "#2A2A2A")
+    other_theme = "dark" if theme == "light" else "light"
+    links = "".join(f'<li><a href="{rel}" download>{html.escape(label)}</a></li>' for label, rel in downloads)
+    data = json.dumps(figures, separators=(",", ":")).replace("</", "<\\/")
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Healthcare in Lebanon</title>
+<style>
+body {{ margin: 0 auto; max-width: 1100px; padding: 2rem 4rem 3rem; font-family: sans-serif;
+       line-height: 1.5; color: {fg}; background: {bg}; }}
+@media (max-width: 700px) {{ body {{ padding: 1rem; }} }}
+h1, h2 {{ text-align: center; font-weight: 700; }}
+a {{ color: inherit; }}
+.chart {{ margin-top: 1rem; }}
+.caption, .live, nav {{ opacity: 0.75; font-size: 0.9rem; }}
+</style>
+</head>
+<body>
+<nav><a href="{THEMES[other_theme]}">{other_theme.title()} theme</a></nav>
+{body}
+<h2>Downloads</h2>
+<ul>{links}</ul>
+<p class="caption">Built {time.strftime("%Y-%m-%d %H:%M")} from {html.escape(os.path.basename(snapshot.version[0]))}.</p>
+<script src="{plotly_src}"></script>
+<script id="figures" type="application/json">{data}</script>
+<script>
+JSON.parse(document.getElementById("figures").textContent).forEach(function (fig, i) {{
+  Plotly.newPlot("fig" + i, fig.data, fig.layout, {{responsive: true, displaylogo: false}});
+}});
+</script>
+</body>
+</html>
+"""
+
+
+# ---------------------- Build -----------------------
+t0 = time.perf_counter()
+out = os.path.abspath(args.out)
+# Only ever replace a previous export
+if os.path.isdir(out) and os.listdir(out) and not os.path.exists(os.path.join(out, "manifest.json")):
+    parser.error(f"{args.out} is not empty and is not a previous export")
+
+snapshot = shared_store().current()  # fails here, before anything is written
+# Built next to the target and swapped in at the end, so a failed build leaves
+# neither partial output nor a missing previous export
+os.makedirs(os.path.dirname(out), exist_ok=True)
+build_dir = tempfile.mkdtemp(prefix=".export-", dir=os.path.dirname(out))
+try:
+    for sub in ("assets", "data"):
+        os.makedirs(os.path.join(build_dir, sub))
+    plotly_src = write_hashed("assets", "plotly", ".min.js", get_plotlyjs().encode())
+    downloads = []
+    for name, table in (("districts", snapshot.districts), ("governorates", snapshot.governorates)):
+        table = table.rename_axis("area")
+        downloads.append((f"{name}.csv", write_hashed("data", name, ".csv", table.to_csv().encode())))
+        downloads.append((f"{name}.json", write_hashed("data", name, ".json",
+                                                       table.reset_index().to_json(orient="records").encode())))
+
+    for theme, filename in THEMES.items():
+        at = run_page(theme)
+        text = page(at, theme, plotly_src, downloads).encode()
+        with open(os.path.join(build_dir, filename), "wb") as f:
+            f.write(text)
+        manifest[filename] = {"sha256": hashlib.sha256(text).hexdigest(), "bytes": len(text)}
+
+    with open(os.path.join(build_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(snapshot.version[0]), "files": manifest}, f, indent=1)
+    os.chmod(build_dir, 0o755)  # mkdtemp creates it private
+except BaseException:
+    shutil.rmtree(build_dir, ignore_errors=True)
+    raise
+# Move the previous export aside rather than deleting it first: if the swap
+# fails it is moved back, and it is only removed once the new one is in place
+trash = tempfile.mkdtemp(prefix=".export-old-", dir=os.path.dirname(out))
+previous = os.path.join(trash, "previous")
+try:
+    if os.path.isdir(out):
+        os.rename(out, previous)
+    try:
+        os.replace(build_dir, out)
+    except BaseException:
+        if os.path.isdir(previous):
+            os.rename(previous, out)
+        raise
+except BaseException:
+    shutil.rmtree(build_dir, ignore_errors=True)
+    raise
+finally:
+    shutil.rmtree(trash, ignore_errors=True)
+
+total = sum(m["bytes"] for m in manifest.values())
+print(f"{args.out}: {len(manifest)} files, {total:,} bytes in {time.perf_counter() - t0:.1f}s")
@@ -0,0 +1,138 @@
+import ast
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+# Safe, vectorized formula evaluation over named columns, e.g.
+#   evaluate("pharmacies / care_centers * 100", {"pharmacies": arr, ...})
+# Formulas are parsed once into a whitelisted AST, compiled to a tree of
+# NumPy calls and cached by text. Names with spaces go in backticks.
+
+MAX_FORMULA_LENGTH = 500
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def divide(a, b):
+    # Element-wise a / b with NaN where b == 0
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b == 0, np.nan, a / b)
+
+
+BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: divide,
+    ast.Pow: np.power,
+}
+UNARY_OPS = {ast.USub: np.negative, ast.UAdd: np.positive}
+# name -> (function, number of arguments). Arity is checked at compile time:
+# an extra positional argument to a ufunc would be taken as its `out` array.
+# round() also accepts a whole-number constant for the decimals, round(x, 1).
+FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "sqrt": (np.sqrt, 1),
+    "log": (np.log, 1),
+    "log10": (np.log10, 1),
+    "exp": (np.exp, 1),
+    "round": (np.round, 1),
+    "min": (np.minimum, 2),
+    "max": (np.maximum, 2),
+}
+
+
+@dataclass(frozen=True)
+class Compiled:
+    text: str
+    names: frozenset
+    fn: Callable
+
+
+def _build(node, names: set, quoted: dict) -> Callable:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = float(node.value)
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = quoted.get(node.id, node.id)
+        names.add(name)
+        return lambda env: env[name]
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        op = BINARY_OPS[type(node.op)]
+        left, right = _build(node.left, names, quoted), _build(node.right, names, quoted)
+        return lambda env: op(left(env), right(env))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        op = UNARY_OPS[type(node.op)]
+        operand = _build(node.operand, names, quoted)
+        return lambda env: op(operand(env))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+        if node.keywords:
+            raise ExpressionError(f"{node.func.id}() takes no keyword arguments")
+        name = node.func.id
+        func, arity = FUNCTIONS[name]
+        arg_nodes = node.args
+        if name == "round" and len(arg_nodes) == 2:
+            digits = arg_nodes[1]
+            if not (isinstance(digits, ast.Constant) and type(digits.value) is int):
+                raise ExpressionError("round() decimals must be a whole number, e.g. round(x, 1)")
+            func = lambda x, decimals=digits.value: np.round(x, decimals)
+            arg_nodes = arg_nodes[:1]
+        if len(arg_nodes) != arity:
+            expected = "1 or 2 arguments" if name == "round" else f"{arity} argument{'' if arity == 1 else 's'}"
+            raise ExpressionError(f"{name}() takes {expected}, got {len(node.args)}")
+        args = [_build(a, names, quoted) for a in arg_nodes]
+        return lambda env: func(*(a(env) for a in args))
+    raise ExpressionError(f"Unsupported syntax in formula: {ast.unparse(node)!r}")
+
+
+@lru_cache(maxsize=256)
+def compile_expr(text: str) -> Compiled:
+    if len(text) > MAX_FORMULA_LENGTH:
+        raise ExpressionError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters")
+    # `Column with spaces` -> placeholder identifiers
+    quoted = {}
+
+    def _quote(m):
+        key = f"__col{len(quoted)}"
+        quoted[key] = m.group(1)
+        return key
+
+    src = re.sub(r"`([^`]+)`", _quote, text.strip())
+    try:
+        tree = ast.parse(src, mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid formula: {e.msg}") from None
+    names = set()
+    fn = _build(tree.body, names, quoted)
+    return Compiled(text, frozenset(names), fn)
+
+
+def evaluate(text: str, columns: dict, n_rows: int = None) -> np.ndarray:
+    expr = compile_expr(text)
+    missing = sorted(expr.names - columns.keys())
+    if missing:
+        raise ExpressionError(f"Unknown column(s): {', '.join(missing)}")
+    try:
+        # float64 throughout: integer columns (uint8 flags and counts) would wrap around
+        env = {name: np.asarray(columns[name], dtype=float) for name in expr.names}
+        with np.errstate(all="ignore"):
+            out = np.asarray(expr.fn(env), dtype=float)
+    except (TypeError, ValueError) as e:
+        # e.g. a text column in arithmetic, or columns of different lengths
+        raise ExpressionError(f"Cannot evaluate formula: {e}") from None
+    if n_rows is None:
+        n_rows = len(next(iter(columns.values()))) if columns else 1
+    return np.broadcast_to(out, (n_rows,)) if out.ndim == 0 else out
+
+
+def alias(name: str) -> str:
+    # "Total number of care centers" -> "total_number_of_care_centers"
+    key = re.sub(r"[^0-9a-zA-Z]+", "_", str(name)).strip("_").lower()
+    return f"c_{key}" if key[:1].isdigit() else key
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Cross-indicator analytics over the district table (healthcare_data.aggregate_districts),
+# as whole-matrix NumPy operations: one division for every per-town ratio, one
+# corrcoef for every facility pair, one weighted z-score sum for the score.
+# Computed on demand through Snapshot.analytics, so only viewers who open the
+# section pay for it, once per dataset version.
+
+# Towns with the facility, as a share of the district's towns
+COVERAGE = {
+    "aid": "First aid center",
+    "nearby_care": "Nearby care centers",
+    "health_resources": "Health resources",
+    "needs": "Special needs care center",
+}
+# Facility counts, reported per town and correlated with each other
+FACILITIES = {
+    "clinics": "Clinics",
+    "pharmacies": "Pharmacies",
+    "hospitals": "Hospitals",
+    "labs": "Labs and radiology",
+    "medical_centers": "Medical centers",
+    "care_centers": "Care centers",
+    "first_aid_centers": "First aid centers",
+}
+# Weight of each per-town ratio in the underserved score
+SCORE_WEIGHTS = {"aid": 2.0, "needs": 2.0, "health_resources": 1.0, "nearby_care": 1.0,
+                 "clinics": 1.0, "pharmacies": 1.0, "hospitals": 1.0}
+
+
+@dataclass(frozen=True)
+class Analytics:
+    coverage: pd.DataFrame      # districts x COVERAGE labels, 0-1
+    per_town: pd.DataFrame      # districts x FACILITIES labels
+    correlations: pd.DataFrame  # FACILITIES x FACILITIES, Pearson
+    underserved: pd.DataFrame   # score (higher = more underserved) and rank, worst first
+
+
+def zscores(x: np.ndarray) -> np.ndarray:
+    # Column-wise; a constant column scores 0 everywhere
+    std = x.std(axis=0)
+    return np.divide(x - x.mean(axis=0), std, out=np.zeros_like(x), where=std > 0)
+
+
+def compute(districts: pd.DataFrame) -> Analytics:
+    keys = list(COVERAGE) + list(FACILITIES)
+    counts = districts[keys].to_numpy(dtype=float)
+    towns = districts["towns"].to_numpy(dtype=float)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(towns > 0, counts / towns, np.nan)
+
+    n_cov = len(COVERAGE)
+    index = districts.index
+    coverage = pd.DataFrame(ratios[:, :n_cov], index=index, columns=list(COVERAGE.values()))
+    per_town = pd.DataFrame(ratios[:, n_cov:], index=index, columns=list(FACILITIES.values()))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.corrcoef(counts[:, n_cov:], rowvar=False)
+    correlations = pd.DataFrame(corr, index=per_town.columns, columns=per_town.columns)
+
+    # Negated weighted mean z-score of the ratios: low coverage scores high
+    cols = [keys.index(k) for k in SCORE_WEIGHTS]
+    weights = np.array(list(SCORE_WEIGHTS.values()))
+    score = -(zscores(np.nan_to_num(ratios[:, cols])) @ weights) / weights.sum()
+    order = np.argsort(-score, kind="stable")
+    underserved = pd.DataFrame({"score": score[order], "rank": np.arange(1, len(order) + 1)},
+                               index=index[order])
+    return Analytics(coverage, per_town, correlations, underserved)
@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.colors import sample_colorscale
+
+import perf
+from healthcare_data import AREA_COL, METRICS, Ranking, Snapshot, town_profile
+from healthcare_store import year_over_year
+from lebanon_geo import outlines
+
+MAP_METRICS = ("needs", "aid", "clinics", "pharmacies", "care_centers", "hospitals")
+MAP_COLORSCALE = "Blues"
+NO_DATA_COLOR = "#A0AEC0"
+CHANGE_METRICS = ("aid", "needs", "first_aid_centers", "care_centers")
+CHANGE_COLORS = ("#E53935", "#A0AEC0", "#2F855A")  # loss, no change, growth
+
+
+# ---------------------- Figure Cache -----------------------
+def bar_figure(ranking: Ranking, key: str, n: int, title: str, x_title: str) -> go.Figure:
+    # One figure per (metric, top N) and session. Reruns reuse it and only
+    # restyle it, so theme, mobile and highlight toggles skip the rebuild.
+    cache = st.session_state.setdefault("_figures", {})
+    fig, owner = cache.get((key, n), (None, None))
+    if owner is not ranking:  # first use, or the dataset changed
+        perf.cache_miss()
+        areas, values = ranking.top(n)
+        # Reversed so the largest bar ends up on top
+        fig = go.Figure(go.Bar(
+            x=values[::-1],
+            y=areas[::-1],
+            orientation="h",
+            text=values[::-1],
+            textposition="auto",
+            cliponaxis=False,
+            hovertemplate=f"{AREA_COL}=%{{y}}<br>count=%{{x}}<extra></extra>",
+        ))
+        fig.update_layout(
+            title={"text": title, "x": 0.5, "xanchor": "center"},
+            xaxis_title=x_title,
+            yaxis_title="Governorate / District",
+            height=max(500, 30 * len(areas)),
+            showlegend=False,
+        )
+        cache[(key, n)] = (fig, ranking)
+    return fig
+
+
+def style_figure(fig: go.Figure, colors: np.ndarray, background_color: str, text_color: str) -> go.Figure:
+    # Patch colors in place; colors are in ranking order (largest first)
+    fig.data[0].marker.color = colors[::-1]
+    fig.update_layout(
+        paper_bgcolor=background_color,
+        plot_bgcolor=background_color,
+        font_color=text_color,
+    )
+    return fig
+
+
+def map_figure(table: pd.DataFrame, key: str, detail: str, label: str) -> go.Figure:
+    # Filled governorate outlines on plain axes: no map tiles or topojson to fetch.
+    # Cached per (metric, detail) and session like bar_figure().
+    cache = st.session_state.setdefault("_figures", {})
+    fig, owner = cache.get(("map", key, detail), (None, None))
+    if owner is not table:
+        perf.cache_miss()
+        values = table[key]
+        lo, hi = min(0, values.min()), values.max()  # counts: scale starts at zero
+        fig = go.Figure()
+        for name, (lons, lats) in outlines(detail).items():
+            value = values.get(name)
+            color = NO_DATA_COLOR if value is None else \
+                sample_colorscale(MAP_COLORSCALE, [(value - lo) / ((hi - lo) or 1)])[0]
+            fig.add_trace(go.Scatter(
+                x=lons, y=lats, fill="toself", fillcolor=color, mode="lines",
+                line_width=1, hoveron="fills",
+                name=f"{name}: {'no data' if value is None else value}",
+            ))
+        # Invisible marker trace that only carries the color bar
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None], mode="markers", hoverinfo="skip",
+            marker={"colorscale": MAP_COLORSCALE, "cmin": lo, "cmax": hi, "color": [lo],
+                    "showscale": True, "colorbar": {"title": {"text": label}}},
+        ))
+        fig.update_layout(
+            title={"text": f"{label} by Governorate", "x": 0.5, "xanchor": "center"},
+            height=650,
+            showlegend=False,
+        )
+        fig.update_xaxes(visible=False)
+        # Equirectangular with x stretched by 1/cos(34 deg), Lebanon's latitude
+        fig.update_yaxes(visible=False, scaleanchor="x", scaleratio=1.2)
+        cache[("map", key, detail)] = (fig, table)
+    return fig
+
+
+def change_figure(yearly: pd.DataFrame, key: str, start: int, end: int, label: str) -> go.Figure:
+    # Per-district change between two survey years, cached like bar_figure()
+    cache = st.session_state.setdefault("_figures", {})
+    fig, owner = cache.get(("change", key, start, end), (None, None))
+    if owner is not yearly:
+        perf.cache_miss()
+        change = year_over_year(yearly, key, start, end)
+        fig = go.Figure(go.Bar(
+            x=change["change"],
+            y=change.index,
+            orientation="h",
+            marker_color=np.array(CHANGE_COLORS)[np.sign(change["change"].to_numpy()).astype(int) + 1],
+            customdata=change[["start", "end"]],
+            hovertemplate=f"%{{y}}<br>{start}: %{{customdata[0]}}<br>{end}: %{{customdata[1]}}"
+                          "<br>change: %{x:+}<extra></extra>",
+        ))
+        fig.update_layout(
+            title={"text": f"{label}: {start} to {end}", "x": 0.5, "xanchor": "center"},
+            xaxis_title=f"Change in {label}",
+            yaxis_title="Governorate / District",
+            height=max(500, 30 * len(change)),
+            showlegend=False,
+        )
+        cache[("change", key, start, end)] = (fig, yearly)
+    return fig
+
+
+# ---------------------- Chart Sections -----------------------
+@st.fragment
+def ranked_bar_section(ranking: Ranking, key: str, label: str, title: str, x_title: str,
+                       colors: tuple, background_color: str, text_color: str,
+                       highlight_top_only: bool = False) -> None:
+    # Controls + figure for one metric. As a fragment, its widgets rerun only
+    # this function; the page, data load and other sections are left alone.
+    perf.resume()
+    top_n = st.slider(f"Top N ({label})", 1, len(ranking), min(10, len(ranking)), key=f"top_n_{key}")
+    # Highlight choices: the visible top N, or every area
+    options = ranking.top(top_n)[0] if highlight_top_only else ranking.areas
+    highlight = st.multiselect(f"Highlight Areas ({label})", options.tolist(), key=f"highlight_{key}")
+
+    # colors = (highlighted, normal)
+    bar_colors = np.where(ranking.highlight_mask(top_n, highlight), *colors)
+
+    with perf.stage(f"figure:{key}", cached=True):
+        fig = bar_figure(ranking, key, top_n, title, x_title)
+        style_figure(fig, bar_colors, background_color, text_color)
+    with perf.stage(f"render:{key}"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def map_section(table: pd.DataFrame, background_color: str, text_color: str,
+                detail: str = "full") -> None:
+    # Metric picker + choropleth; like ranked_bar_section, reruns on its own
+    perf.resume()
+    key = st.selectbox("Map metric", MAP_METRICS, format_func=lambda k: METRICS[k].label,
+                       key="map_metric")
+    with perf.stage("figure:map", cached=True):
+        fig = map_figure(table, key, detail, METRICS[key].label)
+        fig.update_traces(line_color=background_color, selector={"fill": "toself"})
+        fig.update_layout(
+            paper_bgcolor=background_color,
+            plot_bgcolor=background_color,
+            font_color=text_color,
+        )
+    with perf.stage("render:map"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def change_section(yearly: pd.DataFrame, background_color: str, text_color: str) -> None:
+    # Metric and year pickers over the stored yearly aggregates
+    perf.resume()
+    years = sorted(yearly.index.get_level_values("year").unique())
+    key = st.selectbox("Measure", CHANGE_METRICS, format_func=lambda k: METRICS[k].label,
+                       key="change_metric")
+    left, right = st.columns(2)
+    start = left.selectbox("From year", years, index=len(years) - 2, key="change_start")
+    end = right.selectbox("To year", years, index=len(years) - 1, key="change_end")
+    with perf.stage("figure:change", cached=True):
+        fig = change_figure(yearly, key, start, end, METRICS[key].label)
+        fig.update_layout(
+            paper_bgcolor=background_color,
+            plot_bgcolor=background_color,
+            font_color=text_color,
+        )
+    with perf.stage("render:change"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def town_lookup_section(snapshot: Snapshot, limit: int = 8) -> None:
+    # Typeahead over the prebuilt town index, then the chosen town's full row
+    perf.resume()
+    query = st.text_input("Search a town", key="town_query", placeholder="e.g. Bireh, Ain el Mir")
+    if not query.strip():
+        return
+    with perf.stage("search"):
+        matches = snapshot.towns.search(query, limit)
+    if not matches:
+        st.info(f"No town matches “{query}”.")
+        return
+    rows = [row for row, _, _ in matches]
+    names = {row: name for row, name, _ in matches}
+    row = st.radio("Matches", rows, format_func=names.get, key="town_match", horizontal=True)
+    st.dataframe(town_profile(snapshot.frame, row), hide_index=True, use_container_width=True)
+
+
+@st.fragment
+def analytics_section(snapshot: Snapshot, background_color: str, text_color: str) -> None:
+    # Off by default: nothing below the toggle runs, or is computed, until it is on
+    perf.resume()
+    if not st.toggle("Show district analytics", key="show_analytics"):
+        return
+    with perf.stage("analytics", cached=True):
+        analytics = snapshot.analytics
+
+    st.markdown('<h3 style="text-align:left;">Most Underserved Areas</h3>', unsafe_allow_html=True)
+    st.caption("Weighted average of how far each area's per-town coverage falls below "
+               "the other areas (z-scores); higher means more underserved.")
+    worst = analytics.underserved.head(10).join(analytics.coverage)
+    st.dataframe(worst, use_container_width=True,
+                 column_config={c: st.column_config.NumberColumn(format="percent")
+                                for c in analytics.coverage.columns}
+                 | {"score": st.column_config.NumberColumn(format="%.2f")})
+
+    st.markdown('<h3 style="text-align:left;">Share of Towns Covered</h3>', unsafe_allow_html=True)
+    st.dataframe(analytics.coverage, use_container_width=True,
+                 column_config={c: st.column_config.NumberColumn(format="percent")
+                                for c in analytics.coverage.columns})
+
+    st.markdown('<h3 style="text-align:left;">Facilities per Town</h3>', unsafe_allow_html=True)
+    st.dataframe(analytics.per_town.round(2), use_container_width=True)
+
+    st.markdown('<h3 style="text-align:left;">How Facility Counts Move Together</h3>', unsafe_allow_html=True)
+    corr = analytics.correlations
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy(), x=corr.columns, y=corr.index, zmin=-1, zmax=1,
+        colorscale="RdBu", text=corr.round(2).to_numpy(), texttemplate="%{text}",
+        hovertemplate="%{y} / %{x}: %{z:.2f}<extra></extra>",
+    ))
+    fig.update_layout(
+        title={"text": "Correlation across districts", "x": 0.5, "xanchor": "center"},
+        height=550,
+        paper_bgcolor=background_color,
+        plot_bgcolor=background_color,
+        font_color=text_color,
+    )
+    st.plotly_chart(fig, use_container_width=True)
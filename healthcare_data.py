@@ -0,0 +1,330 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+import perf
+from arrow_io import read_arrow, write_arrow
+from town_search import TownIndex
+
+_log = logging.getLogger(__name__)
+
+# ---------------------- Dataset Schema -----------------------
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "healthcareds.csv")
+SNAPSHOT_SUFFIX = ".arrow"  # built by build_snapshot.py
+AREA_COL = "Districts and Governorates"
+
+NEEDS_COL = "Existence of special needs care centers - exists"
+AID_COL = "Existence of a first aid center - exists"
+YES_VALUES = {"yes", "y", "true", "t", "1", "exist", "exists"}
+
+# Low-cardinality text columns repeated on every row
+CATEGORY_COLS = ["Town", "refArea", "references", "publisher", "dataset"]
+
+
+def to_flag(s: pd.Series) -> pd.Series:
+    # Numeric 0/1 columns are used as-is; Yes/No style text is normalized
+    if s.dtype == "uint8":
+        return s
+    if pd.api.types.is_numeric_dtype(s):
+        return s.fillna(0).gt(0).astype("uint8")
+    return s.astype(str).str.strip().str.lower().isin(YES_VALUES).astype("uint8")
+
+
+def to_count(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_unsigned_integer_dtype(s):
+        return s
+    s = pd.to_numeric(s, errors="coerce").fillna(0).clip(lower=0)
+    return pd.to_numeric(s.astype("int64"), downcast="unsigned")
+
+
+def area_names(ref_area: pd.Series) -> pd.Series:
+    # ".../page/Akkar_Governorate" -> "Akkar_Governorate", computed once per category
+    if isinstance(ref_area.dtype, pd.CategoricalDtype):
+        cats = ref_area.cat.categories
+        names = cats.astype(str).str.split("/").str[-1].str.strip()
+        mapped = ref_area.map(dict(zip(cats, names))).astype("category")
+        # Keep groupby order alphabetical, as with plain string keys
+        return mapped.cat.reorder_categories(mapped.cat.categories.sort_values())
+    return ref_area.astype(str).str.split("/").str[-1].str.strip().astype("category")
+
+
+# ---------------------- Metric Registry -----------------------
+@dataclass(frozen=True)
+class Metric:
+    column: str
+    label: str
+    parse: Callable[[pd.Series], pd.Series] = to_flag
+    reducer: str = "sum"
+
+
+METRICS = {
+    "needs": Metric(NEEDS_COL, "Special Needs Care Centers"),
+    "no_needs": Metric("Existence of special needs care centers - does not exist",
+                       "Towns without Special Needs Care Centers"),
+    "aid": Metric(AID_COL, "First Aid Centers"),
+    "nearby_care": Metric("Existence of nearby care centers - exists", "Towns with Nearby Care Centers"),
+    "health_resources": Metric("Existence of health resources - exists", "Towns with Health Resources"),
+    "share_with_needs": Metric("Percentage of towns with special needs indiciduals - With special needs",
+                               "Share of Towns with Special Needs Individuals", reducer="mean"),
+    "share_without_needs": Metric("Percentage of towns with special needs indiciduals - Without special needs",
+                                  "Share of Towns without Special Needs Individuals", reducer="mean"),
+    "care_centers": Metric("Total number of care centers", "Care Centers", to_count),
+    "first_aid_centers": Metric("Total number of first aid centers", "First Aid Centers (Total)", to_count),
+    "clinics": Metric("Type and size of medical resources - Clinics", "Clinics", to_count),
+    "pharmacies": Metric("Type and size of medical resources - Pharmacies", "Pharmacies", to_count),
+    "hospitals": Metric("Type and size of medical resources - Hospitals", "Hospitals", to_count),
+    "labs": Metric("Type and size of medical resources - Labs and Radiology ", "Labs and Radiology", to_count),
+    "medical_centers": Metric("Type and size of medical resources - Medical Centers", "Medical Centers", to_count),
+}
+
+
+def parse_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    for m in METRICS.values():
+        if m.column in df.columns:
+            df[m.column] = m.parse(df[m.column])
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    if "refArea" in df.columns and AREA_COL not in df.columns:
+        df[AREA_COL] = area_names(df["refArea"])
+    return df
+
+
+def validate_schema(df: pd.DataFrame) -> list:
+    # Problems that make a parsed frame unusable by the dashboard
+    problems = []
+    for m in METRICS.values():
+        if m.column not in df.columns:
+            problems.append(f'missing column "{m.column}"')
+        elif not pd.api.types.is_unsigned_integer_dtype(df[m.column]):
+            problems.append(f'column "{m.column}" is {df[m.column].dtype}, expected unsigned int')
+    for col in CATEGORY_COLS + [AREA_COL]:
+        if col not in df.columns:
+            problems.append(f'missing column "{col}"')
+        elif not isinstance(df[col].dtype, pd.CategoricalDtype):
+            problems.append(f'column "{col}" is {df[col].dtype}, expected category')
+    return problems
+
+
+# ---------------------- Columnar Snapshot -----------------------
+def snapshot_path(path: str = DATA_PATH) -> str:
+    return os.path.splitext(path)[0] + SNAPSHOT_SUFFIX
+
+
+def read_csv(path: str = DATA_PATH) -> pd.DataFrame:
+    with perf.stage("load"):
+        df = pd.read_csv(path, dtype={c: "category" for c in CATEGORY_COLS})
+    with perf.stage("normalize"):
+        return parse_dataset(df)
+
+
+def write_snapshot(df: pd.DataFrame, out: str) -> None:
+    # Arrow IPC: categoricals stay dictionary-encoded and loading skips CSV
+    # parsing. The loader still converts every column into pandas memory.
+    problems = validate_schema(df)
+    if problems:
+        raise ValueError("Invalid dataset: " + "; ".join(problems))
+    write_arrow(df, out)
+
+
+def read_snapshot(path: str) -> pd.DataFrame:
+    with perf.stage("load"):
+        df = read_arrow(path)
+    problems = validate_schema(df)
+    if problems:
+        raise ValueError(f"Invalid snapshot {path}: " + "; ".join(problems))
+    return df
+
+
+def read_source(source: str, csv_path: str = DATA_PATH) -> pd.DataFrame:
+    # A snapshot that fails to load or validate (e.g. built by an older
+    # schema) must not take the page down: fall back to parsing the CSV
+    if source.endswith(SNAPSHOT_SUFFIX):
+        try:
+            return read_snapshot(source)
+        except (OSError, ValueError) as e:  # pyarrow's errors subclass these
+            _log.warning("Ignoring snapshot %s, reading %s instead: %s", source, csv_path, e)
+    return read_csv(csv_path)
+
+
+def resolve_source(path: str = DATA_PATH) -> str:
+    # Prefer a snapshot that is at least as new as its CSV
+    snap = snapshot_path(path)
+    if os.path.exists(snap) and (
+        not os.path.exists(path) or os.path.getmtime(snap) >= os.path.getmtime(path)
+    ):
+        return snap
+    return path
+
+
+# ---------------------- Aggregates -----------------------
+def dataset_version(path: str = DATA_PATH) -> tuple:
+    # Cache key: a rewritten file changes mtime and/or size
+    source = resolve_source(path)
+    st_ = os.stat(source)
+    return (os.path.abspath(source), st_.st_mtime_ns, st_.st_size)
+
+
+def aggregate_districts(df: pd.DataFrame, by=AREA_COL) -> pd.DataFrame:
+    # All registered metrics in one groupby: districts (or any `by` key) x metric keys
+    specs = {k: (m.column, m.reducer) for k, m in METRICS.items() if m.column in df.columns}
+    table = df.groupby(by, observed=True).agg(**specs, towns=(AREA_COL, "size"))
+    for k, (_, reducer) in specs.items():
+        if reducer == "sum":
+            table[k] = table[k].astype("int64")
+    table.index = table.index.astype(str)
+    return table
+
+
+def aggregate_governorates(df: pd.DataFrame) -> pd.DataFrame:
+    # Metrics per map boundary (lebanon_geo); areas missing from its index are left out
+    from lebanon_geo import governorate_of
+
+    # One lookup per area category, then the same groupby keyed by boundary
+    areas = df[AREA_COL].cat.categories
+    boundary = df[AREA_COL].map(dict(zip(areas, governorate_of(areas))))
+    return aggregate_districts(df, by=boundary)
+
+
+# ---------------------- Rankings -----------------------
+@dataclass(frozen=True)
+class Ranking:
+    areas: np.ndarray   # area names, highest value first
+    values: np.ndarray
+    rank: dict          # area name -> position in areas
+
+    @classmethod
+    def from_series(cls, s: pd.Series) -> "Ranking":
+        # Stable sort: ties keep the table's alphabetical order
+        order = np.argsort(-s.to_numpy(), kind="stable")
+        areas = s.index.to_numpy()[order]
+        values = s.to_numpy()[order]
+        areas.flags.writeable = False  # shared by every session
+        values.flags.writeable = False
+        return cls(areas, values, {a: i for i, a in enumerate(areas)})
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def top(self, n: int) -> tuple:
+        return self.areas[:n], self.values[:n]
+
+    def highlight_mask(self, n: int, selected) -> np.ndarray:
+        # True for each of the top n bars whose area is selected
+        mask = np.zeros(min(n, len(self.areas)), dtype=bool)
+        idx = [self.rank[a] for a in selected if self.rank.get(a, n) < n]
+        mask[idx] = True
+        return mask
+
+
+# ---------------------- Shared Store -----------------------
+@dataclass(frozen=True)
+class Snapshot:
+    # Everything derived from one dataset version; never mutated after build
+    version: tuple
+    frame: pd.DataFrame
+    districts: pd.DataFrame
+    governorates: pd.DataFrame
+    rankings: dict      # metric key -> Ranking
+    towns: TownIndex    # search over the Town column, in frame row order
+
+    @classmethod
+    def build(cls, version: tuple, csv_path: str = DATA_PATH) -> "Snapshot":
+        perf.cache_miss()
+        frame = read_source(version[0], csv_path)
+        with perf.stage("aggregate"):
+            districts = aggregate_districts(frame)
+            governorates = aggregate_governorates(frame)
+        with perf.stage("rank"):
+            ranked = {k: Ranking.from_series(districts[k]) for k in districts.columns}
+        with perf.stage("index"):
+            towns = TownIndex.build(frame["Town"])
+        return cls(version, frame, districts, governorates, ranked, towns)
+
+    @cached_property
+    def analytics(self):
+        # Computed on first access only (see healthcare_analytics), then kept
+        # for the life of this version
+        from healthcare_analytics import compute
+
+        perf.cache_miss()
+        with perf.stage("analytics"):
+            return compute(self.districts)
+
+
+class SharedStore:
+    # One per dataset path and server process, shared by every session.
+    # Readers get the current Snapshot without locking. When the file
+    # changes, one thread builds the new Snapshot while the others keep
+    # reading the old one, then a single assignment swaps it in.
+    def __init__(self, path: str):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Snapshot:
+        snap = self._snapshot
+        if snap is not None and (self._lock.locked() or snap.version == dataset_version(self.path)):
+            return snap
+        with self._lock:
+            version = dataset_version(self.path)
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = Snapshot.build(version, self.path)
+            return self._snapshot
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(path: str = DATA_PATH) -> SharedStore:
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, SharedStore(path))
+    return store
+
+
+def prewarm(path: str = DATA_PATH) -> Snapshot:
+    # Build the snapshot ahead of the first session (see serve.py)
+    return shared_store(path).current()
+
+
+def load_dataset(path: str = DATA_PATH) -> pd.DataFrame:
+    # The parsed frame shared by every rerun and session.
+    # Treat it as read-only: derive new frames instead of adding columns.
+    return shared_store(path).current().frame
+
+
+def district_table(path: str = DATA_PATH) -> pd.DataFrame:
+    # Read-only like load_dataset()
+    return shared_store(path).current().districts
+
+
+def governorate_table(path: str = DATA_PATH) -> pd.DataFrame:
+    return shared_store(path).current().governorates
+
+
+def rankings(path: str = DATA_PATH) -> dict:
+    # Metric key -> Ranking, computed once per dataset version
+    return shared_store(path).current().rankings
+
+
+def town_profile(frame: pd.DataFrame, row: int) -> pd.DataFrame:
+    # One town's full row as indicator -> value: place, registered metrics
+    # (by label), then the remaining source columns
+    labels = {m.column: m.label for m in METRICS.values()}
+    first = ["Town", AREA_COL] + list(labels)
+    columns = [c for c in first if c in frame.columns] + [c for c in frame.columns if c not in first]
+    values = frame.iloc[row][columns]
+    return pd.DataFrame({
+        "Indicator": [labels.get(c, c) for c in columns],
+        "Value": values.astype(str).str.strip().to_numpy(),
+    })
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+import pandas as pd
+import streamlit as st
+
+import perf
+from arrow_io import read_arrow, write_arrow
+from healthcare_data import AREA_COL, METRICS, read_csv, validate_schema
+
+# Append-only store of healthcare extracts (one per year and/or partner), filled by ingest.py:
+#   <store>/partitions/<id>.arrow   parsed extract, never rewritten
+#   <store>/aggregates-<n>.arrow    running per-(year, district) sums over all partitions
+#   <store>/manifest.json           partitions + current aggregates file; replaced last,
+#                                   so a crash mid-ingest leaves the previous state intact
+# Aggregates keep sums and town counts rather than means, so adding a
+# partition is a groupby over the new rows plus a sum with the stored table.
+
+STORE_DIR = os.environ.get("HEALTHCARE_STORE",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), "healthcare_store"))
+TOWNS = "towns"
+YEAR_PATTERN = re.compile(r"(?<!\d)(19|20)\d{2}(?!\d)")
+
+
+def manifest_path(store: str = STORE_DIR) -> str:
+    return os.path.join(store, "manifest.json")
+
+
+def read_manifest(store: str = STORE_DIR) -> dict:
+    path = manifest_path(store)
+    if not os.path.exists(path):
+        return {"partitions": [], "aggregates": None}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(obj, out: str) -> None:
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=1)
+    os.replace(tmp, out)
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def extract_year(df: pd.DataFrame) -> int:
+    # "…/Dataset/Health_Resources-Lebanon-2023" -> 2023
+    years = {int(m.group()) for uri in df["dataset"].astype(str).unique()
+             for m in [YEAR_PATTERN.search(uri.rsplit("/", 1)[-1])] if m}
+    if len(years) != 1:
+        raise ValueError(f"Cannot tell the survey year from the dataset URI(s); found {sorted(years) or 'none'}")
+    return years.pop()
+
+
+# ---------------------- Aggregates -----------------------
+def partition_aggregates(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    # Sums per district for one partition; mean metrics are divided by TOWNS on read
+    cols = {k: m.column for k, m in METRICS.items() if m.column in df.columns}
+    grouped = df.groupby(AREA_COL, observed=True)
+    table = grouped[list(cols.values())].sum().astype("int64")
+    table.columns = list(cols)
+    table[TOWNS] = grouped.size()
+    table.index = table.index.astype(str)
+    return table.reset_index().assign(year=year)
+
+
+def merge_aggregates(stored: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    # Only districts x metrics rows are summed; partitions are not re-read
+    if stored is None:
+        return new
+    merged = pd.concat([stored, new]).groupby(["year", AREA_COL], as_index=False).sum()
+    return merged.astype({c: "int64" for c in merged.columns if c not in ("year", AREA_COL)})
+
+
+# ---------------------- Ingestion -----------------------
+def ingest(path: str, store: str = STORE_DIR, year: int = None) -> dict:
+    # Adds one extract; returns its manifest entry (the existing one if already ingested)
+    manifest = read_manifest(store)
+    digest = file_digest(path)
+    for entry in manifest["partitions"]:
+        if entry["sha256"] == digest:
+            return entry
+
+    df = read_csv(path)
+    problems = validate_schema(df)
+    if problems:
+        raise ValueError(f"Invalid extract {path}: " + "; ".join(problems))
+    year = year or extract_year(df)
+    publisher = df["publisher"].astype(str).iloc[0] if len(df) else ""
+
+    os.makedirs(os.path.join(store, "partitions"), exist_ok=True)
+    part_id = f"{year}-{digest[:12]}"
+    write_arrow(df, os.path.join(store, "partitions", part_id + ".arrow"))
+
+    old = manifest["aggregates"]
+    stored = read_arrow(os.path.join(store, old)) if old else None
+    aggregates = f"aggregates-{len(manifest['partitions']) + 1:04d}.arrow"
+    write_arrow(merge_aggregates(stored, partition_aggregates(df, year)), os.path.join(store, aggregates))
+
+    entry = {"id": part_id, "year": year, "publisher": publisher, "source": os.path.basename(path),
+             "rows": len(df), "sha256": digest, "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    manifest = {"partitions": manifest["partitions"] + [entry], "aggregates": aggregates}
+    _write_json(manifest, manifest_path(store))
+    if old:
+        os.remove(os.path.join(store, old))
+    return entry
+
+
+def read_aggregates(store: str = STORE_DIR) -> pd.DataFrame:
+    # Running sums as stored: year, district, metric sums, TOWNS
+    return read_arrow(os.path.join(store, read_manifest(store)["aggregates"]))
+
+
+def rebuild_aggregates(store: str = STORE_DIR) -> pd.DataFrame:
+    # Full recompute from the partitions, to check the running sums
+    merged = None
+    for entry in read_manifest(store)["partitions"]:
+        df = read_arrow(os.path.join(store, "partitions", entry["id"] + ".arrow"))
+        merged = merge_aggregates(merged, partition_aggregates(df, entry["year"]))
+    return merged
+
+
+# ---------------------- Dashboard Access -----------------------
+def store_version(store: str = STORE_DIR):
+    path = manifest_path(store)
+    if not os.path.exists(path):
+        return None
+    st_ = os.stat(path)
+    return (os.path.abspath(path), st_.st_mtime_ns, st_.st_size)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _yearly(version: tuple) -> pd.DataFrame:
+    perf.cache_miss()
+    table = read_aggregates(os.path.dirname(version[0])).set_index(["year", AREA_COL]).sort_index()
+    for k, m in METRICS.items():
+        if m.reducer == "mean" and k in table.columns:
+            table[k] = table[k] / table[TOWNS]
+    return table
+
+
+def yearly_table(store: str = STORE_DIR):
+    # (year, district) x metric keys, like district_table(); None without a store
+    version = store_version(store)
+    return None if version is None else _yearly(version)
+
+
+def year_over_year(yearly: pd.DataFrame, key: str, start: int, end: int) -> pd.DataFrame:
+    # Districts present in either year, with the change from start to end
+    both = yearly[key].unstack("year").reindex(columns=[start, end]).fillna(0)
+    both.columns = ["start", "end"]
+    both["change"] = both["end"] - both["start"]
+    return both.sort_values("change", kind="stable")
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+from PIL import Image, features  # Pillow comes with Streamlit
+
+# Display-sized renditions of the carousel photos, encoded once on disk and
+# kept in memory as bytes, so a Next/Previous click is a dictionary lookup.
+# Where the cache folder can't be written, the original file is served.
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+WIDTHS = (480, 960)  # phones, everything else
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "renditions")
+FORMAT, SUFFIX = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class ByteLRU:
+    # Thread-safe LRU of encoded images, bounded by total size in bytes
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data: bytes) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_bytes = ByteLRU(MAX_CACHE_BYTES)
+
+
+def rendition_path(src: str, width: int) -> str:
+    # The stem keeps names readable; the hash of the full path keeps kids.jpg
+    # and kids.png (or same-named files in two folders) apart
+    stem = os.path.splitext(os.path.basename(src))[0]
+    digest = hashlib.sha1(os.path.abspath(src).encode()).hexdigest()[:10]
+    return os.path.join(CACHE_DIR, f"{stem}-{digest}-{width}{SUFFIX}")
+
+
+def make_rendition(src: str, width: int) -> str:
+    # Re-encode only when the source is newer than its rendition
+    out = rendition_path(src, width)
+    if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(src):
+        return out
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with Image.open(src) as img:
+        img.thumbnail((width, width * 10))  # downscale only, keep aspect ratio
+        if FORMAT == "JPEG" or img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGB" if FORMAT == "JPEG" else "RGBA")
+        tmp = out + ".tmp"
+        img.save(tmp, FORMAT, quality=80, optimize=True)
+    os.replace(tmp, out)
+    return out
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _scan(image_dir: str, mtime_ns: int) -> list:
+    files = sorted(os.path.join(image_dir, f) for f in os.listdir(image_dir)
+                   if f.lower().endswith(IMAGE_EXTS))
+    try:
+        for f in files:
+            for w in WIDTHS:
+                make_rendition(f, w)
+    except OSError:
+        pass  # read-only deployment: image_bytes falls back to the originals
+    return files
+
+
+def list_images(image_dir: str) -> list:
+    # Rescanned (and renditions rebuilt) only when the folder changes
+    return _scan(image_dir, os.stat(image_dir).st_mtime_ns)
+
+
+def display_width() -> int:
+    # Rendition width for this session's browser: the small one for phones
+    agent = st.context.headers.get("User-Agent", "")
+    return WIDTHS[0] if "Mobi" in agent else WIDTHS[-1]
+
+
+def image_bytes(src: str, width: int = WIDTHS[-1]) -> bytes:
+    width = min((w for w in WIDTHS if w >= width), default=WIDTHS[-1])
+    key = (src, width, os.path.getmtime(src))
+    data = _bytes.get(key)
+    if data is None:
+        try:
+            path = make_rendition(src, width)
+        except OSError:
+            path = src
+        with open(path, "rb") as f:
+            data = f.read()
+        _bytes.put(key, data)
+    return data
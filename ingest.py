@@ -0,0 +1,36 @@
+import argparse
+import time
+
+import pandas as pd
+
+from healthcare_data import AREA_COL
+from healthcare_store import STORE_DIR, ingest, read_aggregates, read_manifest, rebuild_aggregates
+
+# Add yearly or partner extracts to the healthcare store used for the
+# dashboard's year-over-year comparison:
+#   python ingest.py healthcareds.csv [more.csv ...] [--year 2024] [--store DIR]
+parser = argparse.ArgumentParser(description="Append healthcare extracts to the local store.")
+parser.add_argument("csv", nargs="*", help="extract(s) with the healthcareds.csv columns")
+parser.add_argument("--year", type=int, help="survey year (default: from the dataset URI)")
+parser.add_argument("--store", default=STORE_DIR, help=f"store directory (default: {STORE_DIR})")
+parser.add_argument("--check", action="store_true",
+                    help="recompute the aggregates from every partition and compare")
+args = parser.parse_args()
+
+for path in args.csv:
+    t0 = time.perf_counter()
+    entry = ingest(path, args.store, args.year)
+    print(f"{path}: partition {entry['id']} ({entry['year']}, {entry['rows']:,} rows) "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+manifest = read_manifest(args.store)
+print(f"{args.store}: {len(manifest['partitions'])} partition(s), "
+      f"years {sorted({p['year'] for p in manifest['partitions']})}")
+
+if args.check and manifest["partitions"]:
+    keys = ["year", AREA_COL]
+    pd.testing.assert_frame_equal(
+        read_aggregates(args.store).sort_values(keys).reset_index(drop=True),
+        rebuild_aggregates(args.store).sort_values(keys).reset_index(drop=True),
+    )
+    print("check: incremental aggregates match a full recompute")
@@ -0,0 +1,67 @@
+import csv
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+# Offline boundaries for the Healthcare map. data/lebanon_governorates_<detail>.geojson
+# are built by build_boundaries.py from the Lebanon map in echarts-countries-pypkg
+# (MIT), pre-simplified once per detail level. They show the six governorates
+# from before the 2014 split, so Akkar is drawn within North Lebanon and
+# Baalbek-Hermel within Beqaa. data/lebanon_areas.csv maps every governorate and
+# district name (as area_key) to the boundary feature it is drawn in.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+AREAS_PATH = os.path.join(DATA_DIR, "lebanon_areas.csv")
+DETAILS = {"full": 0.0, "simplified": 0.01}  # detail -> simplification tolerance (degrees)
+
+
+def boundary_path(detail: str = "full") -> str:
+    return os.path.join(DATA_DIR, f"lebanon_governorates_{detail}.geojson")
+
+
+def area_key(name: str) -> str:
+    # "ZahlÃ©_District" / "Zahlé District" -> "zahle_district"
+    try:
+        name = name.encode("latin-1").decode("utf-8")  # UTF-8 text misread as Latin-1
+    except UnicodeError:
+        pass
+    name = "".join(c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c))
+    return re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+
+
+@lru_cache(maxsize=None)
+def load_boundaries(detail: str = "full") -> dict:
+    if detail not in DETAILS:
+        raise ValueError(f"Unknown detail {detail!r}; expected one of {', '.join(DETAILS)}")
+    with open(boundary_path(detail), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def area_index() -> dict:
+    # area_key -> governorate feature name
+    with open(AREAS_PATH, newline="", encoding="utf-8") as f:
+        return {row["key"]: row["governorate"] for row in csv.DictReader(f)}
+
+
+def governorate_of(names) -> list:
+    # Boundary feature for each area name; None when it is not in the index
+    index = area_index()
+    return [index.get(area_key(str(n))) for n in names]
+
+
+def outlines(detail: str = "full") -> dict:
+    # Feature name -> (lons, lats) with None between rings, ready for a filled trace
+    shapes = {}
+    for feature in load_boundaries(detail)["features"]:
+        geom = feature["geometry"]
+        polys = geom["coordinates"] if geom["type"] == "MultiPolygon" else [geom["coordinates"]]
+        lons, lats = [], []
+        for poly in polys:
+            for ring in poly:
+                lons += [p[0] for p in ring] + [None]
+                lats += [p[1] for p in ring] + [None]
+        shapes[feature["properties"]["name"]] = (lons[:-1], lats[:-1])
+    return shapes
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from contextlib import nullcontext
+
+import streamlit as st
+
+# Opt-in per-stage timing for the Streamlit apps.
+#   with perf.stage("aggregate", cached=True): ...
+# Stages are no-ops unless the session turned recording on (perf.attach()),
+# so with instrumentation off each stage costs one thread-local lookup.
+
+_local = threading.local()
+_NULL = nullcontext()
+MAX_RECORDS = 1000
+# tracemalloc is process-wide: it runs only while some live recorder traces
+_tracing = weakref.WeakSet()
+_tracing_lock = threading.Lock()
+
+
+class Recorder:
+    def __init__(self, trace_alloc: bool = False):
+        self.trace_alloc = trace_alloc
+        self.records = deque(maxlen=MAX_RECORDS)
+        self._open = []
+        if trace_alloc:
+            _tracing.add(self)
+
+    def stage(self, name: str, cached: bool = False) -> "_Stage":
+        return _Stage(self, name, cached)
+
+    def to_jsonl(self) -> str:
+        return "\n".join(json.dumps(r) for r in self.records) + "\n"
+
+    def latest(self) -> list:
+        # Most recent record per stage, in first-seen order
+        rows = {}
+        for r in self.records:
+            rows[r["stage"]] = r
+        return list(rows.values())
+
+
+class _Stage:
+    def __init__(self, recorder: Recorder, name: str, cached: bool):
+        self.recorder = recorder
+        self.record = {"stage": name, "cache": "hit" if cached else None}
+
+    def __enter__(self):
+        self.recorder._open.append(self.record)
+        if self.recorder.trace_alloc:
+            self._mem = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        r = self.record
+        r["ms"] = round((time.perf_counter() - self._t0) * 1000, 3)
+        if self.recorder.trace_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            r["alloc_kb"] = round((current - self._mem) / 1024, 1)
+            r["peak_kb"] = round((peak - self._mem) / 1024, 1)
+        r["ts"] = time.time()
+        self.recorder._open.pop()
+        self.recorder.records.append(r)
+        return False
+
+
+def stage(name: str, cached: bool = False):
+    rec = getattr(_local, "recorder", None)
+    if rec is None:
+        return _NULL
+    return rec.stage(name, cached)
+
+
+def cache_miss() -> None:
+    # Called from inside cached functions: marks the enclosing cached stage
+    rec = getattr(_local, "recorder", None)
+    if rec is not None:
+        for r in reversed(rec._open):
+            if r["cache"] is not None:
+                r["cache"] = "miss"
+                break
+
+
+# ---------------------- Streamlit Panel -----------------------
+def _update_tracing() -> None:
+    with _tracing_lock:
+        if _tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not _tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def attach(enabled: bool, trace_alloc: bool = False):
+    # Bind this session's recorder to the running script (and fragment) thread.
+    # Turning the panel off drops the recorder, so fragments stop recording too.
+    if enabled:
+        rec = st.session_state.get("_perf")
+        if rec is None or rec.trace_alloc != trace_alloc:
+            rec = st.session_state["_perf"] = Recorder(trace_alloc)
+    else:
+        st.session_state.pop("_perf", None)
+        rec = None
+    _local.recorder = rec
+    _update_tracing()
+    return rec
+
+
+def resume() -> None:
+    # Fragment reruns skip the page script, so re-bind the recorder here
+    _local.recorder = st.session_state.get("_perf")
+
+
+def panel(rec: Recorder) -> None:
+    with st.expander("⏱️ Performance", expanded=True):
+        rows = rec.latest()
+        if not rows:
+            st.caption("No stages recorded yet.")
+            return
+        st.dataframe(
+            [{k: v for k, v in r.items() if k != "ts"} for r in rows],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.download_button("Download JSON lines", rec.to_jsonl(),
+                           file_name="perf.jsonl", mime="application/jsonl")
@@ -0,0 +1,79 @@
+import argparse
+import importlib
+import os
+import threading
+import time
+
+from streamlit.web import bootstrap
+
+# Start a Streamlit app with its data already loading, instead of waiting for
+# the first visitor to pay for the parse and aggregates:
+#   python serve.py Healthcare.py [--port 8501] [--watch 30]
+# Other server settings come from .streamlit/config.toml or STREAMLIT_* variables.
+# Warm-up runs in a background thread while the server starts: it first imports
+# the heavy modules the app's first run needs (see benchmarks/startup_report.py),
+# then builds the data. A session that arrives first waits for that same import
+# or build rather than starting its own.
+
+
+def warm_healthcare() -> None:
+    import healthcare_data
+    import healthcare_store
+
+    healthcare_data.prewarm()
+    healthcare_store.yearly_table()
+
+
+def warm_uber() -> None:
+    import uber_data
+
+    if os.path.exists(uber_data.DATA_PATH):
+        uber_data.load_index()
+
+
+# Imported once per server process, so no session pays for them
+PRELOADS = {
+    "Healthcare.py": ("streamlit.emojis", "healthcare_charts"),
+    "HealthcareBU.py": ("streamlit.emojis", "pandas", "plotly.express", "PIL.Image"),
+    "BMI.py": ("bmi_core", "bmi_for_age", "bmi_batch"),
+    "Calculator.py": ("streamlit.emojis", "expr_eval"),
+    "uber_pickups.py": ("uber_data", "pydeck"),
+}
+
+WARMERS = {
+    "Healthcare.py": warm_healthcare,
+    "Calculator.py": warm_healthcare,
+    "uber_pickups.py": warm_uber,
+}
+
+
+def warm(script: str, watch: float) -> None:
+    name = os.path.basename(script)
+    t0 = time.perf_counter()
+    for module in PRELOADS.get(name, ()):
+        importlib.import_module(module)
+    if name in PRELOADS:
+        print(f"serve: {name} modules loaded in {time.perf_counter() - t0:.2f}s", flush=True)
+    warmer = WARMERS.get(name)
+    if warmer is None:
+        return
+    t0 = time.perf_counter()
+    warmer()
+    print(f"serve: {name} data ready in {time.perf_counter() - t0:.2f}s", flush=True)
+    # Polling makes the rebuild after a file change happen here, not in a session
+    while watch:
+        time.sleep(watch)
+        warmer()
+
+
+parser = argparse.ArgumentParser(description="Run a Streamlit app with its data prewarmed.")
+parser.add_argument("script", help="app script, e.g. Healthcare.py")
+parser.add_argument("--watch", type=float, default=0,
+                    help="seconds between checks for a changed data file (default: off)")
+parser.add_argument("--port", type=int, help="server port (default: Streamlit's)")
+args = parser.parse_args()
+
+flags = {"server_port": args.port}
+bootstrap.load_config_options(flag_options=flags)
+threading.Thread(target=warm, args=(args.script, args.watch), name="prewarm", daemon=True).start()
+bootstrap.run(args.script, False, [], flags)
@@ -0,0 +1,29 @@
+import io
+
+import numpy as np
+
+from bmi_batch import process_csv
+from bmi_core import CATEGORIES, bmi_category, bmi_codes, compute_bmi
+
+
+def test_adult_cutoffs():
+    assert list(bmi_category(np.array([18.49, 18.5, 24.99, 25.0, 30.0]))) == [
+        "Underweight", "Normal weight", "Normal weight", "Overweight", "Obesity"]
+
+
+def test_invalid_inputs_are_never_binned_as_patients():
+    w = np.array([-5.0, 0.0, 0.0, np.nan, 70.0])
+    h = np.array([1.5, 1.5, 0.0, 1.5, np.nan])
+    bmi = compute_bmi(w, h)
+    assert list(CATEGORIES[bmi_codes(bmi, w)]) == [
+        "Invalid weight", "Invalid weight", "Invalid height", "Missing data", "Missing data"]
+    assert bmi_category(-2.2) == "Invalid weight"
+
+
+def test_batch_counts_and_output():
+    src = io.StringIO("weight_kg,height_cm\n-5,150\n70,175\n,150\n")
+    out = io.StringIO()
+    counts, child_counts = process_csv(src, out)
+    assert dict(zip(CATEGORIES, counts))["Invalid weight"] == 1
+    assert child_counts is None
+    assert out.getvalue().splitlines()[1] == "-5.0,150,,Invalid weight"
@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+import pytest
+
+from bmi_batch import process_csv
+from bmi_for_age import CHILD_CUTOFFS, bmi_z, child_category, z_to_percentile
+
+
+@pytest.mark.parametrize("z, category", [
+    (-3.01, "Severe thinness"),
+    (-3.0, "Thinness"),     # severe thinness is z < -3
+    (-2.01, "Thinness"),
+    (-2.0, "Normal weight"),  # thinness is z < -2
+    (1.0, "Normal weight"),   # overweight is z > +1
+    (1.01, "Overweight"),
+    (2.0, "Overweight"),      # obesity is z > +2
+    (2.01, "Obesity"),
+    (np.nan, "Out of range"),
+])
+def test_who_cutoffs(z, category):
+    assert child_category(z, "WHO2007") == category
+
+
+@pytest.mark.parametrize("i, below, at", [
+    (0, "Underweight", "Healthy weight"),  # 5th percentile
+    (1, "Healthy weight", "Overweight"),   # 85th
+    (2, "Overweight", "Obesity"),          # 95th
+])
+def test_cdc_cutoffs_start_their_band(i, below, at):
+    cutoff = CHILD_CUTOFFS["CDC2000"][i]
+    assert child_category(np.nextafter(cutoff, -np.inf), "CDC2000") == below
+    assert child_category(cutoff, "CDC2000") == at
+
+
+def test_child_category_is_vectorized():
+    assert list(child_category(np.array([-3.0, 1.0, 2.1]), "WHO2007")) == ["Thinness", "Normal weight", "Obesity"]
+
+
+@pytest.mark.parametrize("bmi, z", [
+    # WHO 2007 BMI-for-age, boys 5:1 years (61 months), published SD table (0.1 BMI precision)
+    (13.0, -2.0),
+    (15.3, 0.0),
+    (16.6, 1.0),
+    (18.3, 2.0),
+])
+def test_who_published_sd_values(bmi, z):
+    assert bmi_z(bmi, 61, 1, "WHO2007") == pytest.approx(z, abs=0.05)
+
+
+@pytest.mark.parametrize("bmi, percentile", [
+    # CDC 2000 bmiagerev, boys 24 months: published P85 and P95
+    (18.16219, 85.0),
+    (19.32553, 95.0),
+])
+def test_cdc_published_percentiles(bmi, percentile):
+    assert z_to_percentile(bmi_z(bmi, 24, 1, "CDC2000")) == pytest.approx(percentile, abs=0.1)
+
+
+def test_median_is_z_zero():
+    # M of the WHO2007 girls 120-month row
+    assert bmi_z(16.6133, 120, 2, "WHO2007") == pytest.approx(0.0, abs=1e-9)
+
+
+def test_batch_reports_bmi_for_age_distribution():
+    src = io.StringIO("weight_kg,height_cm,sex,age_years\n30,130,f,10\n45,130,m,10\n,150,1,12\n70,175,M,30\n")
+    counts, child_counts = process_csv(src, io.StringIO())
+    assert child_counts["Normal weight"] == 1
+    assert child_counts["Obesity"] == 1
+    assert child_counts["Missing data"] == 1
+    assert child_counts["Out of range"] == 1  # the 30-year-old
+    assert sum(child_counts.values()) == counts.sum()
@@ -0,0 +1,90 @@
+import re
+
+import numpy as np
+import pytest
+
+from expr_eval import ExpressionError, compile_expr, evaluate
+
+COLUMNS = {
+    "a": np.array([1.0, 2.0, 4.0]),
+    "b": np.array([2.0, 0.0, -1.0]),
+    "flags": np.array([0, 200, 255], dtype=np.uint8),
+}
+
+
+def test_arithmetic_and_division_by_zero():
+    out = evaluate("a / b * 100", COLUMNS)
+    assert out[0] == 50.0
+    assert np.isnan(out[1])
+    assert out[2] == -400.0
+
+
+def test_backticks_and_names():
+    expr = compile_expr("`total count` + a")
+    assert expr.names == {"total count", "a"}
+
+
+def test_constant_broadcasts_to_rows():
+    np.testing.assert_array_equal(evaluate("2 + 3", COLUMNS, 3), [5.0, 5.0, 5.0])
+
+
+def test_integer_columns_do_not_wrap():
+    np.testing.assert_array_equal(evaluate("flags - 255", COLUMNS), [-255.0, -55.0, 0.0])
+    np.testing.assert_array_equal(evaluate("flags * flags", COLUMNS), [0.0, 40000.0, 65025.0])
+    np.testing.assert_array_equal(evaluate("-flags", COLUMNS), [0.0, -200.0, -255.0])
+
+
+@pytest.mark.parametrize("formula", [
+    "__import__('os')",
+    "a.real",
+    "a[0]",
+    "a if b else 1",
+    "open('x')",
+    "lambda: 1",
+    "'text'",
+    "abs(a, out=b)",
+    "sqrt(*a)",
+])
+def test_rejects_syntax_outside_the_whitelist(formula):
+    with pytest.raises(ExpressionError):
+        evaluate(formula, COLUMNS)
+
+
+@pytest.mark.parametrize("formula, message", [
+    ("max(a, b, flags)", "max() takes 2 arguments, got 3"),
+    ("abs(a, b)", "abs() takes 1 argument, got 2"),
+    ("min(a)", "min() takes 2 arguments, got 1"),
+    ("sqrt()", "sqrt() takes 1 argument, got 0"),
+    ("round(a, 1, 2)", "round() takes 1 or 2 arguments, got 3"),
+    ("round(a, b)", "round() decimals must be a whole number"),
+    ("round(a, 1.5)", "round() decimals must be a whole number"),
+])
+def test_arity(formula, message):
+    with pytest.raises(ExpressionError, match=re.escape(message)):
+        evaluate(formula, COLUMNS)
+
+
+def test_extra_arguments_never_write_to_columns():
+    columns = {k: v.copy() for k, v in COLUMNS.items()}
+    for formula in ("max(a, b, flags)", "abs(a, b)"):
+        with pytest.raises(ExpressionError):
+            evaluate(formula, columns)
+    for k, v in COLUMNS.items():
+        np.testing.assert_array_equal(columns[k], v)
+
+
+def test_round():
+    np.testing.assert_array_equal(evaluate("round(a / 3, 2)", COLUMNS), [0.33, 0.67, 1.33])
+    np.testing.assert_array_equal(evaluate("round(a / 3)", COLUMNS), [0.0, 1.0, 1.0])
+
+
+def test_unknown_column():
+    with pytest.raises(ExpressionError, match="Unknown column"):
+        evaluate("a + missing", COLUMNS)
+
+
+def test_numpy_errors_become_expression_errors():
+    with pytest.raises(ExpressionError):
+        evaluate("a + b", {"a": np.arange(3.0), "b": np.arange(4.0)})
+    with pytest.raises(ExpressionError):
+        evaluate("a * 2", {"a": np.array(["x", "y"], dtype=object)})
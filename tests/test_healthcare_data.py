@@ -0,0 +1,44 @@
+import logging
+import os
+import shutil
+
+import pytest
+
+from arrow_io import write_arrow
+from healthcare_data import DATA_PATH, SharedStore, read_csv, snapshot_path, write_snapshot
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    path = str(tmp_path / "healthcareds.csv")
+    shutil.copy(DATA_PATH, path)
+    return path
+
+
+def _make_newer(path, than):
+    t = os.path.getmtime(than) + 10
+    os.utime(path, (t, t))
+
+
+def test_valid_snapshot_is_used(csv_copy):
+    write_snapshot(read_csv(csv_copy), snapshot_path(csv_copy))
+    _make_newer(snapshot_path(csv_copy), csv_copy)
+    snap = SharedStore(csv_copy).current()
+    assert snap.version[0].endswith(".arrow")
+    assert len(snap.frame) == len(read_csv(csv_copy))
+
+
+@pytest.mark.parametrize("corrupt", ["schema", "bytes"])
+def test_bad_snapshot_falls_back_to_csv(csv_copy, corrupt, caplog):
+    snap_path = snapshot_path(csv_copy)
+    if corrupt == "schema":  # e.g. written by an older schema
+        write_arrow(read_csv(csv_copy).drop(columns=["Town"]), snap_path)
+    else:
+        with open(snap_path, "wb") as f:
+            f.write(b"not an arrow file")
+    _make_newer(snap_path, csv_copy)
+    with caplog.at_level(logging.WARNING, logger="healthcare_data"):
+        snap = SharedStore(csv_copy).current()
+    assert "Ignoring snapshot" in caplog.text
+    assert "Town" in snap.frame.columns
+    assert len(snap.frame) == len(read_csv(csv_copy))
@@ -0,0 +1,22 @@
+import os
+
+from PIL import Image
+
+import image_cache
+from image_cache import rendition_path
+
+
+def test_rendition_names_differ_by_extension_and_folder(tmp_path):
+    paths = {rendition_path(str(tmp_path / name), 480)
+             for name in ("kids.jpg", "kids.png", os.path.join("other", "kids.jpg"))}
+    assert len(paths) == 3
+    assert rendition_path(str(tmp_path / "kids.jpg"), 480) != rendition_path(str(tmp_path / "kids.jpg"), 960)
+
+
+def test_same_stem_images_get_their_own_renditions(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    Image.new("RGB", (600, 300), "red").save(tmp_path / "kids.jpg")
+    Image.new("RGB", (300, 600), "blue").save(tmp_path / "kids.png")
+    for name, expected in (("kids.jpg", (480, 240)), ("kids.png", (300, 600))):
+        with Image.open(image_cache.make_rendition(str(tmp_path / name), 480)) as img:
+            assert img.size == expected
@@ -0,0 +1,81 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+
+# Typeahead search over town names. Names are folded to a spelling-insensitive
+# key (accents, punctuation, doubled letters and common transliteration
+# variants removed), then indexed by character trigrams: a query is scored by
+# counting the trigrams it shares with each town through one bincount over
+# the posting lists, so nothing scans the names per keystroke.
+
+# Applied in order to the lowercased, punctuation-free name
+FOLDS = (
+    (re.compile(r"([a-z])\1+"), r"\1"),   # "aaridet" / "zennad" -> "aridet" / "zenad"
+    (re.compile(r"ou"), "u"),
+    (re.compile(r"(?<![ks])h(?=[^aeiou ]|$)"), ""),  # silent h after a vowel: "bireh" ~ "bire"
+    (re.compile(r"ch"), "sh"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"(ei|ey|ay)"), "ai"),
+    (re.compile(r"ee"), "i"),
+)
+
+
+def fold(name: str) -> str:
+    # " A'ain El-Mir (El Establ)" -> "ain el mir el establ"
+    name = "".join(c for c in unicodedata.normalize("NFKD", str(name)) if not unicodedata.combining(c))
+    name = re.sub(r"['`’]", "", name.lower())
+    name = " ".join(re.sub(r"[^0-9a-z]+", " ", name).split())
+    for pattern, repl in FOLDS:
+        name = pattern.sub(repl, name)
+    return name
+
+
+def trigrams(key: str, closed: bool = True) -> list:
+    # Start padding lets short prefixes match; a query is left open at the end
+    padded = "  " + key + (" " if closed else "")
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+@dataclass(frozen=True)
+class TownIndex:
+    names: np.ndarray       # display names, in row order
+    keys: np.ndarray        # folded names
+    grams: dict             # trigram -> town ids (int32, sorted)
+    n_grams: np.ndarray     # trigrams per key
+
+    @classmethod
+    def build(cls, names) -> "TownIndex":
+        names = np.asarray([str(n).strip() for n in names], dtype=object)
+        keys = np.asarray([fold(n) for n in names], dtype=object)
+        postings = {}
+        n_grams = np.empty(len(keys), dtype=np.int32)
+        for i, key in enumerate(keys):
+            grams = trigrams(key)
+            n_grams[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        grams = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        return cls(names, keys, grams, n_grams)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        # [(row, name, score)] best first; score 1.0 is an exact folded match
+        q = fold(query)
+        if not q:
+            return []
+        q_grams = trigrams(q, closed=False)
+        hits = [self.grams[g] for g in q_grams if g in self.grams]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        # Mostly query coverage; the Dice term prefers the shorter of equal hits
+        score = 0.8 * shared / len(q_grams) + 0.2 * 2 * shared / (len(q_grams) + self.n_grams)
+        top = np.flatnonzero(shared)
+        if len(top) > limit:
+            top = top[np.argpartition(-score[top], limit - 1)[:limit]]
+        top = top[np.lexsort((self.keys[top], -score[top]))]
+        return [(int(i), self.names[i], float(min(score[i], 1.0))) for i in top]
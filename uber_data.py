@@ -0,0 +1,179 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from arrow_io import read_arrow, write_arrow
+
+# Offline loader for the Uber pickups demo. Point UBER_DATA_PATH at a local
+# copy of the monthly extract (download once from DATA_URL); the parsed frame
+# is cached as an Arrow file next to it, so later cold starts skip the CSV.
+# Rows are stored sorted by (hour, day) so time filters are array slices, and
+# each row's grid cell is precomputed so maps can send cell counts, not points.
+
+DATA_URL = ('https://s3-us-west-2.amazonaws.com/'
+            'streamlit-demo-data/uber-raw-data-sep14.csv.gz')
+DATA_PATH = os.environ.get("UBER_DATA_PATH", "uber-raw-data-sep14.csv.gz")
+DATE_COLUMN = 'date/time'
+DATE_FORMAT = "%m/%d/%Y %H:%M:%S"  # e.g. 9/1/2014 0:01:00
+CHUNKSIZE = 500_000
+GRID_CELL_DEG = 0.001  # finest grid cell, about 110 m north-south
+GRID_LEVELS = 8        # each level doubles the cell size
+DTYPES = {"Lat": "float32", "Lon": "float32", "Base": "category"}
+
+
+def cache_path(path: str) -> str:
+    base = path[:-3] if path.endswith(".gz") else path
+    return os.path.splitext(base)[0] + ".arrow"
+
+
+def read_csv(path: str, chunksize: int = CHUNKSIZE) -> pd.DataFrame:
+    # Chunked parse keeps the float64/object intermediates to one chunk at a time
+    chunks = []
+    for chunk in pd.read_csv(path, dtype=DTYPES, chunksize=chunksize):
+        chunk.columns = chunk.columns.str.lower()
+        chunk[DATE_COLUMN] = pd.to_datetime(chunk[DATE_COLUMN], format=DATE_FORMAT)
+        chunks.append(chunk)
+    data = pd.concat(chunks, ignore_index=True)
+    # Chunks may disagree on categories; unify them once at the end
+    if "base" in data.columns:
+        data["base"] = data["base"].astype(str).astype("category")
+    return data
+
+
+# ---------------------- Spatial Grid -----------------------
+@dataclass(frozen=True)
+class SpatialGrid:
+    # Finest-level cell of every row; coarser levels are a right shift
+    ix: np.ndarray
+    iy: np.ndarray
+
+    @classmethod
+    def build(cls, lat, lon) -> "SpatialGrid":
+        ix = np.floor((np.asarray(lon, dtype=float) + 180) / GRID_CELL_DEG).astype(np.int32)
+        iy = np.floor((np.asarray(lat, dtype=float) + 90) / GRID_CELL_DEG).astype(np.int32)
+        return cls(ix, iy)
+
+    def aggregate(self, rows=slice(None), max_cells: int = 5000) -> tuple:
+        # (cells, level): pickups per cell for the selected rows, at the finest
+        # level with at most max_cells non-empty cells
+        ix, iy = self.ix[rows], self.iy[rows]
+        codes, counts = np.unique((iy.astype(np.int64) << 32) | ix, return_counts=True)
+        level = 0
+        while len(codes) > max_cells and level < GRID_LEVELS - 1:
+            # Merge 2 x 2 blocks of the previous level's cells
+            level += 1
+            codes, inverse = np.unique(((codes >> 33) << 32) | ((codes & 0xFFFFFFFF) >> 1),
+                                       return_inverse=True)
+            counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        size = GRID_CELL_DEG * 2 ** level
+        cells = pd.DataFrame({
+            "lat": ((codes >> 32) + 0.5) * size - 90,
+            "lon": ((codes & 0xFFFFFFFF) + 0.5) * size - 180,
+            "count": counts,
+        })
+        return cells, level
+
+
+# ---------------------- Time Index -----------------------
+def time_codes(dates: pd.Series) -> tuple:
+    # (hour, day number since the first day, first day)
+    days = dates.to_numpy().astype("datetime64[D]")
+    first_day = days.min()
+    return dates.dt.hour.to_numpy(), (days - first_day).astype(np.int64), first_day
+
+
+def sort_by_time(data: pd.DataFrame) -> pd.DataFrame:
+    hour, day, _ = time_codes(data[DATE_COLUMN])
+    order = np.argsort(hour * (day.max() + 1) + day, kind="stable")
+    return data.take(order).reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class TimeIndex:
+    data: pd.DataFrame      # rows sorted by (hour, day)
+    first_day: np.datetime64
+    counts: np.ndarray      # pickups per [hour, day]
+    offsets: np.ndarray     # first row of each (hour, day) block, plus the end
+    grid: SpatialGrid
+    version: tuple = ()     # (path, mtime_ns, size) of the source file
+
+    @classmethod
+    def build(cls, data: pd.DataFrame, version: tuple = ()) -> "TimeIndex":
+        hour, day, first_day = time_codes(data[DATE_COLUMN])
+        n_days = int(day.max()) + 1
+        codes = hour * n_days + day
+        if (np.diff(codes) < 0).any():  # e.g. an unsorted cache from an older version
+            return cls.build(sort_by_time(data), version)
+        counts = np.bincount(codes, minlength=24 * n_days)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        grid = SpatialGrid.build(data["lat"], data["lon"])
+        return cls(data, first_day, counts.reshape(24, n_days), offsets, grid, version)
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.first_day + np.arange(self.counts.shape[1])
+
+    def day_mask(self, day=None, dow=None) -> np.ndarray:
+        # Days to keep; day is a date, dow 0 = Monday
+        mask = np.ones(self.counts.shape[1], dtype=bool)
+        if day is not None:
+            mask &= self.days == np.datetime64(day, "D")
+        if dow is not None:
+            # 1970-01-01 (day 0) was a Thursday
+            mask &= (self.days.view("int64") + 3) % 7 == dow
+        return mask
+
+    def hour_histogram(self, day=None, dow=None) -> np.ndarray:
+        return self.counts[:, self.day_mask(day, dow)].sum(axis=1)
+
+    def rows(self, hour: int, day=None, dow=None):
+        # One hour is a contiguous block (a slice); a day/weekday filter picks
+        # sub-blocks of it (an array of row positions)
+        n_days = self.counts.shape[1]
+        if day is None and dow is None:
+            return slice(self.offsets[hour * n_days], self.offsets[(hour + 1) * n_days])
+        blocks = hour * n_days + np.flatnonzero(self.day_mask(day, dow))
+        rows = [np.arange(self.offsets[b], self.offsets[b + 1]) for b in blocks]
+        return np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+
+    def select(self, hour: int, day=None, dow=None) -> pd.DataFrame:
+        return self.data.iloc[self.rows(hour, day, dow)]
+
+    def grid_cells(self, hour: int, day=None, dow=None, max_cells: int = 5000) -> tuple:
+        # (cells, level) of grid.aggregate, computed once per filter and file
+        # version and shared by every session; callers must not modify cells
+        return _grid_cells(self, self.version, hour, day, dow, max_cells)
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _grid_cells(_index: TimeIndex, version: tuple, hour: int, day, dow, max_cells: int) -> tuple:
+    # _index is not hashed: version identifies it
+    return _index.grid.aggregate(_index.rows(hour, day, dow), max_cells)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load(path: str, mtime_ns: int, size: int) -> TimeIndex:
+    version = (path, mtime_ns, size)
+    cached = cache_path(path)
+    if os.path.exists(cached) and os.stat(cached).st_mtime_ns >= mtime_ns:
+        return TimeIndex.build(read_arrow(cached), version)
+    data = sort_by_time(read_csv(path))
+    try:
+        write_arrow(data, cached)
+    except OSError:
+        pass  # read-only deployment: keep working from the CSV
+    return TimeIndex.build(data, version)
+
+
+def load_index(path: str = DATA_PATH) -> TimeIndex:
+    # Full month parsed and indexed once per file version, shared by every session
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Uber pickups file not found at {path!r}. Download it from {DATA_URL} "
+            "and set UBER_DATA_PATH to its location."
+        )
+    st_ = os.stat(path)
+    return _load(os.path.abspath(path), st_.st_mtime_ns, st_.st_size)
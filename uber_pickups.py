@@ -1,38 +1,65 @@
-import streamlit as st
-import pandas as pd
 import numpy as np
-st.title('Uber pickups in NYC')
+import streamlit as st
 
-DATE_COLUMN = 'date/time'
-DATA_URL = ('https://s3-us-west-2.amazonaws.com/'
-            'streamlit-demo-data/uber-raw-data-sep14.csv.gz')
+from uber_data import load_index
 
-@st.cache_data
-def load_data(nrows):
-    data = pd.read_csv(DATA_URL, nrows=nrows)
-    lowercase = lambda x: str(x).lower()
-    data.rename(lowercase, axis = 'columns', inplace=True)
-    data[DATE_COLUMN]= pd.to_datetime(data[DATE_COLUMN])
-    data[DATE_COLUMN]= pd.to_datetime(data[DATE_COLUMN])
-    return data
+st.title('Uber pickups in NYC')
+
+RAW_POINT_LIMIT = 5000  # above this, the map gets grid-cell counts instead of points
+MAX_CELLS = 5000
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
 #Create a text element and let the reader know the data is loading.
 data_load_state = st.text('Loading data...')
-#Load 10,000 rows of data into the dataframe.
-data = load_data(10000)
+#Load the full month from the local file (parsed and indexed once, then read from its Arrow cache).
+try:
+    index = load_index()
+except FileNotFoundError as e:
+    data_load_state.empty()
+    st.error(str(e))
+    st.stop()
 #Notify the reader that the data was successfully loaded.
-data_load_state.text('Done! (using st.cache_data)')
+data = index.data
+data_load_state.text(f'Done! ({len(data):,} pickups, using st.cache_resource)')
 
 if  st.checkbox('Show raw data'):
     st.subheader('Raw data')
-    st.write(data)
+    #The first 10,000 rows; the full month is too large to send to the browser.
+    st.write(data.head(10000))
+
+#Optional weekday filter (0 = Monday), applied to both the histogram and the map.
+dow = st.selectbox('Day of week', [None, 0, 1, 2, 3, 4, 5, 6],
+                   format_func=lambda d: 'All days' if d is None else DAY_NAMES[d])
 
 st.subheader('Number of pickups by hour')
-hist_values = np.histogram(data[DATE_COLUMN].dt.hour, bins=24, range=(0,24))[0]
+#Precomputed pickups per (hour, day): summing a 24 x days table, not scanning rows.
+hist_values = index.hour_histogram(dow=dow)
 
 st.bar_chart(hist_values)
 
 hour_to_filter = st.slider('hour',0, 23, 17) #min: 0h, max: 23h, default: 17h
-filtered_data = data[data[DATE_COLUMN].dt.hour == hour_to_filter]
+#Rows are stored sorted by hour, so this is a slice rather than a full-column comparison.
+rows = index.rows(hour_to_filter, dow=dow)
+filtered_data = index.data.iloc[rows]
 st.subheader(f'Map of all pickups at {hour_to_filter}:00')
-st.map(filtered_data)
\ No newline at end of file
+if len(filtered_data) <= RAW_POINT_LIMIT:
+    #st.map can't serialize float32 centers, so widen just the filtered rows.
+    st.map(filtered_data.astype({'lat': 'float64', 'lon': 'float64'}))
+else:
+    #Aggregate on the server: the browser gets at most MAX_CELLS weighted cells.
+    #pydeck (and its jinja2) is only imported for this branch; st.map doesn't need it.
+    import pydeck as pdk
+
+    #Cells are cached per (hour, weekday), so moving back to a seen hour is a lookup.
+    cells, level = index.grid_cells(hour_to_filter, dow=dow, max_cells=MAX_CELLS)
+    st.pydeck_chart(pdk.Deck(
+        map_style=None,
+        initial_view_state=pdk.ViewState(
+            latitude=float(np.median(filtered_data['lat'])),
+            longitude=float(np.median(filtered_data['lon'])),
+            zoom=10),
+        layers=[pdk.Layer('HeatmapLayer', data=cells, get_position=['lon', 'lat'],
+                          get_weight='count', radius_pixels=30)],
+    ))
+    st.caption(f'{len(filtered_data):,} pickups in {len(cells):,} grid cells '
+               f'of about {110 * 2 ** level} m')
\ No newline at end of file